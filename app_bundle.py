@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Incremental macOS app-bundle builder
+
+A content-hash manifest inside the bundle records what produced each
+file, so a rebuild only rewrites files whose inputs changed. Unchanged
+files keep their mtimes, and large assets are hardlinked or reflinked
+from their source instead of copied.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+MANIFEST_PATH = "Contents/.build-manifest.json"
+
+# Linux FICLONE ioctl, used to reflink on copy-on-write filesystems
+_FICLONE = 0x40049409
+
+def text_file(content, mode=0o644):
+    """Bundle entry whose content is generated in memory"""
+    return {"content": content.encode('utf-8'), "mode": mode}
+
+def asset_file(source, mode=0o644):
+    """Bundle entry linked or copied from a file on disk"""
+    return {"source": source, "mode": mode}
+
+def _source_mode(source):
+    return os.stat(source).st_mode & 0o7777
+
+def _digest(entry):
+    digest = hashlib.sha256(f"mode:{entry['mode']:o}\0".encode())
+    if "content" in entry:
+        digest.update(entry["content"])
+    else:
+        # A hardlink shares its source's mode, so a chmod of the source
+        # changes what the bundle holds
+        digest.update(f"source-mode:{_source_mode(entry['source']):o}\0".encode())
+        with open(entry["source"], 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def _load_manifest(app_dir):
+    try:
+        with open(os.path.join(app_dir, MANIFEST_PATH)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _link_or_copy(source, target, mode):
+    """Hardlink, reflink or (as a last resort) copy `source` to `target`
+
+    A hardlink shares the source's mode and cannot be chmodded without
+    changing the source, so it is only used when the modes already match.
+    """
+    if _source_mode(source) == mode:
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            pass
+    try:
+        import fcntl
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except (ImportError, OSError):
+        shutil.copy2(source, target)
+    os.chmod(target, mode)
+
+def _write_entry(path, entry):
+    temp_path = f"{path}.tmp"
+    if os.path.lexists(temp_path):
+        os.remove(temp_path)
+    if "content" in entry:
+        with open(temp_path, 'wb') as f:
+            f.write(entry["content"])
+        os.chmod(temp_path, entry["mode"])
+    else:
+        _link_or_copy(entry["source"], temp_path, entry["mode"])
+    os.replace(temp_path, path)
+
+def build_bundle(app_dir, files, clean=False):
+    """Bring `app_dir` in line with `files` ({relative path: entry})
+
+    Returns (written, unchanged) file counts.
+    """
+    if clean and os.path.exists(app_dir):
+        shutil.rmtree(app_dir)
+
+    previous = _load_manifest(app_dir)
+    manifest = {}
+    written = 0
+
+    for relative_path, entry in files.items():
+        path = os.path.join(app_dir, relative_path)
+        digest = _digest(entry)
+        manifest[relative_path] = digest
+        if previous.get(relative_path) == digest and os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_entry(path, entry)
+        written += 1
+
+    # Drop files an earlier build produced that are no longer wanted
+    for relative_path in previous.keys() - manifest.keys():
+        try:
+            os.remove(os.path.join(app_dir, relative_path))
+        except OSError:
+            pass
+
+    if manifest != previous:
+        manifest_file = os.path.join(app_dir, MANIFEST_PATH)
+        os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+        with open(f"{manifest_file}.tmp", 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(f"{manifest_file}.tmp", manifest_file)
+
+    return written, len(files) - written
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark the icon rendering backends
+
+Each backend renders every size in a fresh process, recording wall time,
+how far rendering raised peak RSS above where it stood after the imports,
+the peak of memory tracemalloc saw the render allocate, and how many
+blocks the render left allocated (tracemalloc cannot count allocation
+calls, so that is not a count of allocations made). Results are compared
+against a JSON baseline and the run fails when a case regresses past the
+threshold. The baseline is machine-specific, so it is written to
+icon_benchmark_baseline.json in the current directory on the first run
+(or with --update) and is not committed.
+The render cache is bypassed and no macOS tools are needed, so this runs
+headless on Linux.
+
+Usage: python3 benchmark_icons.py [--update] [--baseline FILE] [--threshold 0.25]
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+# Backend name -> (module, render function taking a size)
+BACKENDS = {
+    "pil": ("create_vibe_icon_pil", "render_vibe_icon"),
+    "cairo": ("create_vibe_icon", "render_vibe_image"),
+    "svg": ("create_icon", "render_icon"),
+}
+
+SIZES = [16, 32, 64, 128, 256, 512, 1024]
+
+DEFAULT_BASELINE = "icon_benchmark_baseline.json"
+
+# Metrics compared against the baseline
+COMPARED_METRICS = ["wall_seconds", "render_rss_bytes"]
+
+# Growth below this is page-granularity noise, not a regression
+MIN_RSS_GROWTH = 1024 * 1024
+
+def _peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _measure(backend, size, repeat):
+    """Run one backend/size case; executed in a fresh worker process"""
+    module_name, function_name = BACKENDS[backend]
+    try:
+        render = getattr(importlib.import_module(module_name), function_name)
+    except (ImportError, OSError) as error:
+        return {"skipped": str(error)}
+    # NumPy, PIL and cairo alone take tens of MiB; only growth past this
+    # point is down to rendering
+    import_rss = _peak_rss_bytes()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(size)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    image = render(size)
+    _, peak = tracemalloc.get_traced_memory()
+    # Blocks the render allocated that are still alive (mostly the image);
+    # tracing starts with the render, so nothing from the imports counts
+    retained = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del image
+
+    peak_rss = _peak_rss_bytes()
+    return {
+        "wall_seconds": min(times),
+        "peak_rss_bytes": peak_rss,
+        "render_rss_bytes": peak_rss - import_rss,
+        "alloc_peak_bytes": peak,
+        "retained_blocks": retained,
+    }
+
+def run_benchmarks(backends, sizes, repeat):
+    """Measure every backend at every size, one fresh process per case"""
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in backends:
+        for size in sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results[f"{backend}/{size}"] = pool.submit(_measure, backend, size, repeat).result()
+    return results
+
+def find_regressions(results, baseline, threshold):
+    """List (case, metric, baseline, current) tuples that got worse than allowed"""
+    regressions = []
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if not previous or "skipped" in current or "skipped" in previous:
+            continue
+        for metric in COMPARED_METRICS:
+            # Baselines written before a metric existed are not compared on it
+            if metric not in previous:
+                continue
+            if metric == "render_rss_bytes" and current[metric] - previous[metric] < MIN_RSS_GROWTH:
+                continue
+            if current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((case, metric, previous[metric], current[metric]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the icon rendering backends")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON baseline file")
+    parser.add_argument("--update", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed renders per case")
+    parser.add_argument("--backend", action="append", choices=sorted(BACKENDS),
+                        help="backend to run (repeatable, default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.backend or list(BACKENDS), args.sizes, args.repeat)
+
+    print(f"{'case':<14} {'wall ms':>10} {'render RSS MiB':>15} {'peak RSS MiB':>13} "
+          f"{'alloc KiB':>10} {'retained':>9}")
+    for case, result in results.items():
+        if "skipped" in result:
+            print(f"{case:<14} skipped: {result['skipped']}")
+            continue
+        print(f"{case:<14} {result['wall_seconds'] * 1000:>10.2f} "
+              f"{result['render_rss_bytes'] / 2**20:>15.1f} "
+              f"{result['peak_rss_bytes'] / 2**20:>13.1f} "
+              f"{result['alloc_peak_bytes'] / 1024:>10.1f} {result['retained_blocks']:>9}")
+
+    if args.update or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+        print(f"📝 Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for case, metric, previous, current in regressions:
+        print(f"❌ {case} {metric}: {previous:.4g} -> {current:.4g}")
+    if regressions:
+        return 1
+    print("✅ No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,21 +2,15 @@
 """
 Create a friend-friendly version of the app that hides localhost completely
 """
+import argparse
 import os
-import shutil
 
-def create_friend_app():
+from app_bundle import asset_file, build_bundle, text_file
+
+def create_friend_app(clean=False):
     app_name = "Vibe Transcribe"
     app_dir = f"{app_name} - Friend Edition.app"
     
-    # Remove existing app if it exists
-    if os.path.exists(app_dir):
-        shutil.rmtree(app_dir)
-    
-    # Create app bundle structure
-    os.makedirs(f"{app_dir}/Contents/MacOS", exist_ok=True)
-    os.makedirs(f"{app_dir}/Contents/Resources", exist_ok=True)
-    
     # Create Info.plist
     info_plist = f'''<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
@@ -47,9 +41,6 @@ def create_friend_app():
 </dict>
 </plist>'''
     
-    with open(f"{app_dir}/Contents/Info.plist", 'w') as f:
-        f.write(info_plist)
-    
     # Create the friend-friendly launcher script
     launcher_script = f'''#!/bin/bash
 
@@ -175,21 +166,30 @@ fi
 wait $SERVER_PID
 '''
     
-    with open(f"{app_dir}/Contents/MacOS/vibe-transcribe-friend", 'w') as f:
-        f.write(launcher_script)
-    
-    # Make the launcher executable
-    os.chmod(f"{app_dir}/Contents/MacOS/vibe-transcribe-friend", 0o755)
+    files = {
+        "Contents/Info.plist": text_file(info_plist),
+        # The launcher must be executable
+        "Contents/MacOS/vibe-transcribe-friend": text_file(launcher_script, mode=0o755),
+    }
     
-    # Copy the icon
+    # Link the icon
     icon_source = "vibe_icon.svg.png"
     if os.path.exists(icon_source):
-        shutil.copy2(icon_source, f"{app_dir}/Contents/Resources/AppIcon.png")
+        files["Contents/Resources/AppIcon.png"] = asset_file(icon_source)
+    
+    # Only rewrite files whose inputs changed since the last build
+    written, unchanged = build_bundle(app_dir, files, clean=clean)
+    os.makedirs(f"{app_dir}/Contents/Resources", exist_ok=True)
     
+    print(f"🔁 {written} files written, {unchanged} unchanged")
     print(f"✅ Friend-friendly app created: {app_dir}")
     print("🎯 This version hides all technical details from users!")
     print("📱 Your friend will see a clean native-looking app")
     print("🚫 No localhost, no browser UI, no technical messages")
 
 if __name__ == "__main__":
-    create_friend_app()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--clean", action="store_true",
+                        help="delete the existing bundle and rebuild it from scratch")
+    args = parser.parse_args()
+    create_friend_app(clean=args.clean)
\ No newline at end of file
@@ -2,22 +2,14 @@
 """
 Create macOS icon from your logo
 """
-import os
 import subprocess
+import sys
 
-def create_icon():
-    # Create iconset directory
-    iconset_dir = "icon.iconset"
-    os.makedirs(iconset_dir, exist_ok=True)
-    
-    # We'll create a simple colored circle as placeholder since we can't process the uploaded image
-    # Your friend can replace this with the actual logo later
-    
-    sizes = [16, 32, 64, 128, 256, 512, 1024]
-    
-    for size in sizes:
-        # Create a simple SVG placeholder
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+ICNS_PATH = "Vibe Transcribe.app/Contents/Resources/icon.icns"
+
+def svg_template(size):
+    """Return the placeholder icon as an SVG document"""
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" xmlns="http://www.w3.org/2000/svg">
   <defs>
     <linearGradient id="borderGradient" x1="0%" y1="0%" x2="100%" y2="100%">
@@ -76,93 +68,65 @@ def create_icon():
           stroke="#334d40" stroke-width="{size//100}" fill="none" stroke-linecap="round"/>
   </g>
 </svg>'''
-        
-        svg_file = f"temp_icon_{size}.svg"
-        with open(svg_file, 'w') as f:
-            f.write(svg_content)
-        
-        # Convert SVG to PNG using built-in tools
-        png_file = f"{iconset_dir}/icon_{size}x{size}.png"
-        
-        # Try different conversion methods
-        try:
-            # Method 1: rsvg-convert (if available)
-            subprocess.run(['rsvg-convert', '-w', str(size), '-h', str(size), svg_file, '-o', png_file], check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            try:
-                # Method 2: ImageMagick convert (if available)
-                subprocess.run(['convert', '-size', f'{size}x{size}', svg_file, png_file], check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                try:
-                    # Method 3: Cairo (if available)
-                    subprocess.run(['cairosvg', svg_file, '-o', png_file, '-W', str(size), '-H', str(size)], check=True)
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    # Fallback: create a simple colored rectangle using PIL
-                    try:
-                        from PIL import Image, ImageDraw, ImageFont
-                        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-                        draw = ImageDraw.Draw(img)
-                        
-                        # Create gradient effect manually
-                        for i in range(size):
-                            for j in range(size):
-                                # Simple gradient calculation
-                                factor = (i + j) / (2 * size)
-                                if factor < 0.25:
-                                    r, g, b = int(102 + factor * 4 * (245 - 102)), int(126 + factor * 4 * (101 - 126)), int(234 + factor * 4 * (101 - 234))
-                                elif factor < 0.5:
-                                    factor = (factor - 0.25) * 4
-                                    r, g, b = int(245 + factor * (72 - 245)), int(101 + factor * (187 - 101)), int(101 + factor * (120 - 101))
-                                elif factor < 0.75:
-                                    factor = (factor - 0.5) * 4
-                                    r, g, b = int(72 + factor * (237 - 72)), int(187 + factor * (137 - 187)), int(120 + factor * (54 - 120))
-                                else:
-                                    factor = (factor - 0.75) * 4
-                                    r, g, b = int(237 + factor * (102 - 237)), int(137 + factor * (126 - 137)), int(54 + factor * (234 - 54))
-                                
-                                img.putpixel((i, j), (r, g, b, 255))
-                        
-                        # Add emoji if font available
-                        try:
-                            font = ImageFont.truetype("/System/Library/Fonts/Apple Color Emoji.ttc", size//2)
-                            draw.text((size//4, size//4), "🐙", font=font, fill=(255, 255, 255, 255))
-                        except:
-                            # Simple circle fallback
-                            draw.ellipse([size//4, size//4, 3*size//4, 3*size//4], fill=(255, 255, 255, 255))
-                        
-                        img.save(png_file)
-                    except ImportError:
-                        # Ultimate fallback: just create an empty file
-                        with open(png_file, 'w') as f:
-                            f.write("")
-        
-        # Clean up
-        try:
-            os.remove(svg_file)
-        except:
-            pass
-        
-        # Also create @2x versions for retina
-        if size <= 512:
-            retina_file = f"{iconset_dir}/icon_{size}x{size}@2x.png"
-            try:
-                subprocess.run(['cp', png_file, retina_file], check=True)
-            except:
-                pass
 
-    # Create the .icns file
+def render_placeholder(size):
+    """Draw a simple gradient placeholder with PIL"""
+    from PIL import ImageDraw, ImageFont
+    from icon_gradient import PLACEHOLDER_GRADIENT_STOPS, create_gradient
+    img = create_gradient(size, size, PLACEHOLDER_GRADIENT_STOPS)
+    draw = ImageDraw.Draw(img)
+    
+    # Add emoji if font available
     try:
-        subprocess.run(['iconutil', '-c', 'icns', iconset_dir, '-o', 'Vibe Transcribe.app/Contents/Resources/icon.icns'], check=True)
-        print("✅ Icon created successfully!")
+        font = ImageFont.truetype("/System/Library/Fonts/Apple Color Emoji.ttc", size//2)
+        draw.text((size//4, size//4), "🐙", font=font, fill=(255, 255, 255, 255))
+    except:
+        # Simple circle fallback
+        draw.ellipse([size//4, size//4, 3*size//4, 3*size//4], fill=(255, 255, 255, 255))
+    
+    return img
+
+def render_icon(size):
+    """Rasterize the SVG placeholder at `size`, falling back to PIL drawing"""
+    import svg_raster
+    try:
+        img = svg_raster.rasterize(svg_template(size), size)
     except subprocess.CalledProcessError:
-        print("⚠️ Could not create .icns file, but app will still work")
+        img = None
     
-    # Clean up
-    import shutil
+    # Fallback: create a simple colored rectangle using PIL
+    return img if img is not None else render_placeholder(size)
+
+def create_icon():
     try:
-        shutil.rmtree(iconset_dir)
-    except:
-        pass
+        import icon_gradient
+        import icon_pipeline
+        import svg_raster
+        from icns_writer import write_icns
+        from icon_cache import cached_icon_set, source_digest
+        from icon_pipeline import ICONSET_ENTRIES, render_icon_set
+    except ImportError:
+        print("⚠️ Pillow is required to build the icon, but app will still work")
+        return
+    
+    # We'll create a simple colored circle as placeholder since we can't process the uploaded image
+    # Your friend can replace this with the actual logo later
+    
+    # Render one supersampled master and downsample it to every iconset
+    # entry, so the @2x files get their real retina resolution. Unchanged
+    # artwork is served from the icon cache without rendering at all.
+    sizes = [size for _, size in ICONSET_ENTRIES]
+    inputs = (source_digest(sys.modules[__name__], icon_gradient, icon_pipeline),)
+    backend = svg_raster.probe_backend() or "pil"
+    images = cached_icon_set(backend, inputs, sizes, lambda: render_icon_set(render_icon, sizes))
+
+    # Create the .icns file straight from the in-memory PNGs, so this
+    # works without iconutil (and off macOS)
+    try:
+        write_icns(ICNS_PATH, {name: images[size] for name, size in ICONSET_ENTRIES})
+        print("✅ Icon created successfully!")
+    except OSError:
+        print("⚠️ Could not create .icns file, but app will still work")
 
 if __name__ == "__main__":
     create_icon()
\ No newline at end of file
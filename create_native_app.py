@@ -2,22 +2,16 @@
 """
 Create a native macOS app wrapper that hides the localhost interface
 """
+import argparse
 import os
 import subprocess
-import shutil
 
-def create_native_app():
+from app_bundle import asset_file, build_bundle, text_file
+
+def create_native_app(clean=False):
     app_name = "Vibe Transcribe"
     app_dir = f"{app_name}.app"
     
-    # Remove existing app if it exists
-    if os.path.exists(app_dir):
-        shutil.rmtree(app_dir)
-    
-    # Create app bundle structure
-    os.makedirs(f"{app_dir}/Contents/MacOS", exist_ok=True)
-    os.makedirs(f"{app_dir}/Contents/Resources", exist_ok=True)
-    
     # Create Info.plist
     info_plist = f'''<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
@@ -53,9 +47,6 @@ def create_native_app():
 </dict>
 </plist>'''
     
-    with open(f"{app_dir}/Contents/Info.plist", 'w') as f:
-        f.write(info_plist)
-    
     # Create the native launcher script
     launcher_script = f'''#!/bin/bash
 
@@ -194,20 +185,29 @@ fi
 wait $SERVER_PID
 '''
     
-    with open(f"{app_dir}/Contents/MacOS/vibe-transcribe-native", 'w') as f:
-        f.write(launcher_script)
-    
-    # Make the launcher executable
-    os.chmod(f"{app_dir}/Contents/MacOS/vibe-transcribe-native", 0o755)
+    files = {
+        "Contents/Info.plist": text_file(info_plist),
+        # The launcher must be executable
+        "Contents/MacOS/vibe-transcribe-native": text_file(launcher_script, mode=0o755),
+    }
     
-    # Copy the icon
+    # Link the icon
     icon_source = "vibe_icon.svg.png"
     if os.path.exists(icon_source):
-        shutil.copy2(icon_source, f"{app_dir}/Contents/Resources/AppIcon.png")
+        files["Contents/Resources/AppIcon.png"] = asset_file(icon_source)
+    
+    # Only rewrite files whose inputs changed since the last build
+    written, unchanged = build_bundle(app_dir, files, clean=clean)
+    os.makedirs(f"{app_dir}/Contents/Resources", exist_ok=True)
     
+    print(f"🔁 {written} files written, {unchanged} unchanged")
     print(f"✅ Native app created: {app_dir}")
     print("🎯 This app will hide localhost from users!")
     print("📱 Users will see a native app interface instead of browser")
 
 if __name__ == "__main__":
-    create_native_app()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--clean", action="store_true",
+                        help="delete the existing bundle and rebuild it from scratch")
+    args = parser.parse_args()
+    create_native_app(clean=args.clean)
\ No newline at end of file
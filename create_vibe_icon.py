@@ -1,6 +1,16 @@
 #!/usr/bin/env python3
+import argparse
 import cairo
+import io
 import math
+import sys
+from PIL import Image
+
+import icon_pipeline
+import octopus_geometry
+from icon_cache import cached_icon_set, source_digest
+from icon_parallel import render_sizes
+from icon_pipeline import render_icon_set
 
 def create_gradient_rounded_rect(ctx, x, y, width, height, radius, gradient_stops):
     """Create a rounded rectangle with gradient border"""
@@ -25,70 +35,51 @@ def draw_octopus(ctx, cx, cy, size):
     ctx.set_source_rgba(0.55, 0.65, 0.55, 1.0)
     
     # Draw main body
-    body_radius = size * 0.25
-    ctx.arc(cx, cy - size * 0.1, body_radius, 0, 2 * math.pi)
+    body_x, body_y, body_radius = octopus_geometry.BODY
+    ctx.arc(cx + body_x * size, cy + body_y * size, body_radius * size, 0, 2 * math.pi)
     ctx.fill()
     
-    # Draw tentacles
-    tentacle_positions = [
-        (-0.3, 0.1, -0.4, 0.4),   # Left tentacle
-        (-0.15, 0.05, -0.2, 0.35), # Left-middle tentacle
-        (0.15, 0.05, 0.2, 0.35),   # Right-middle tentacle
-        (0.3, 0.1, 0.4, 0.4),      # Right tentacle
-        (0, 0.15, 0, 0.45),        # Center tentacle
-    ]
-    
-    for tx1, ty1, tx2, ty2 in tentacle_positions:
+    # Draw tentacles from the shared, pre-tessellated outlines
+    for outline in octopus_geometry.tentacle_outlines(octopus_geometry.tolerance_for(size)):
+        points = octopus_geometry.place(outline, cx, cy, size)
         ctx.new_path()
-        ctx.move_to(cx + tx1 * size, cy + ty1 * size)
-        ctx.curve_to(
-            cx + tx1 * size * 1.2, cy + ty1 * size + size * 0.15,
-            cx + tx2 * size * 0.8, cy + ty2 * size - size * 0.05,
-            cx + tx2 * size, cy + ty2 * size
-        )
-        ctx.line_to(cx + tx2 * size * 0.8, cy + ty2 * size)
-        ctx.curve_to(
-            cx + tx2 * size * 0.6, cy + ty2 * size - size * 0.05,
-            cx + tx1 * size * 0.8, cy + ty1 * size + size * 0.1,
-            cx + tx1 * size * 0.6, cy + ty1 * size
-        )
+        ctx.move_to(*points[0])
+        for x, y in points[1:]:
+            ctx.line_to(x, y)
         ctx.close_path()
         ctx.fill()
     
     # Draw yellow circles on tentacles
     ctx.set_source_rgba(0.9, 0.75, 0.4, 1.0)
-    circle_positions = [
-        (-0.35, 0.25, 0.06),
-        (-0.18, 0.22, 0.05),
-        (0.18, 0.22, 0.05),
-        (0.35, 0.25, 0.06),
-        (0, 0.32, 0.05),
-    ]
-    
-    for cx_off, cy_off, radius in circle_positions:
-        ctx.arc(cx + cx_off * size, cy + cy_off * size, radius * size, 0, 2 * math.pi)
+    for x, y, radius in octopus_geometry.SUCKERS:
+        ctx.arc(cx + x * size, cy + y * size, radius * size, 0, 2 * math.pi)
         ctx.fill()
     
     # Draw face on main body
     ctx.set_source_rgba(0.2, 0.3, 0.25, 1.0)
     
     # Eyes
-    eye_radius = size * 0.02
-    ctx.arc(cx - size * 0.08, cy - size * 0.12, eye_radius, 0, 2 * math.pi)
-    ctx.fill()
-    ctx.arc(cx + size * 0.08, cy - size * 0.12, eye_radius, 0, 2 * math.pi)
-    ctx.fill()
+    for x, y, radius in octopus_geometry.EYES:
+        ctx.arc(cx + x * size, cy + y * size, radius * size, 0, 2 * math.pi)
+        ctx.fill()
     
     # Smile
+    x, y, radius, start, end, line_width = octopus_geometry.SMILE
     ctx.new_path()
-    ctx.arc(cx, cy - size * 0.08, size * 0.08, 0.2 * math.pi, 0.8 * math.pi)
-    ctx.set_line_width(size * 0.015)
+    ctx.arc(cx + x * size, cy + y * size, radius * size, math.radians(start), math.radians(end))
+    ctx.set_line_width(size * line_width)
     ctx.stroke()
 
-def create_vibe_icon(filename, size=1024):
-    """Create the Vibe Transcribe icon"""
-    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
+def render_vibe_icon(size=1024, region=None):
+    """Render the Vibe Transcribe icon onto a cairo surface
+
+    `region` is an optional (x0, y0, x1, y1) box of the size x size icon
+    to render on its own, used to split big sizes across workers.
+    """
+    x0, y0, x1, y1 = region or (0, 0, size, size)
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, x1 - x0, y1 - y0)
     ctx = cairo.Context(surface)
+    ctx.translate(-x0, -y0)
     
     # Clear background
     ctx.set_source_rgba(1, 1, 1, 0)
@@ -127,11 +118,34 @@ def create_vibe_icon(filename, size=1024):
     # Draw octopus in center
     draw_octopus(ctx, size/2, size/2, size * 0.35)
     
-    # Save the image
-    surface.write_to_png(filename)
+    return surface
+
+def surface_to_image(surface):
+    """Convert a cairo surface into a PIL image"""
+    buffer = io.BytesIO()
+    surface.write_to_png(buffer)
+    buffer.seek(0)
+    return Image.open(buffer).convert('RGBA')
+
+def render_vibe_image(size=1024, region=None):
+    """Render the Vibe Transcribe icon into a PIL image"""
+    return surface_to_image(render_vibe_icon(size, region))
+
+def create_vibe_icon(filename, size=1024):
+    """Create the Vibe Transcribe icon"""
+    render_vibe_icon(size).write_to_png(filename)
     print(f"Icon saved as {filename}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the Vibe Transcribe icon")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="worker processes for rendering (0 = one per core)")
+    parser.add_argument("--direct", action="store_true",
+                        help="render every size directly instead of downsampling one master")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-render instead of using the icon cache")
+    args = parser.parse_args()
+    
     # Create icon in multiple sizes
     sizes = {
         "icon_1024.png": 1024,
@@ -140,5 +154,18 @@ if __name__ == "__main__":
         "icon_128.png": 128,
     }
     
+    def render():
+        if args.direct:
+            return render_sizes(render_vibe_image, sizes.values(), args.jobs)
+        # Render one supersampled master and downsample it to every size
+        return render_icon_set(
+            lambda size: render_sizes(render_vibe_image, [size], args.jobs)[size],
+            sizes.values())
+    
+    # Skip rendering entirely when the artwork and sizes are unchanged
+    inputs = (source_digest(sys.modules[__name__], icon_pipeline, octopus_geometry),
+              "direct" if args.direct else f"mipmap-{icon_pipeline.DEFAULT_SUPERSAMPLE}")
+    images = cached_icon_set("cairo", inputs, sizes.values(), render, enabled=not args.no_cache)
     for filename, size in sizes.items():
-        create_vibe_icon(filename, size)
\ No newline at end of file
+        images[size].save(filename, 'PNG')
+        print(f"Icon saved as {filename}")
\ No newline at end of file
@@ -1,47 +1,18 @@
 #!/usr/bin/env python3
 from PIL import Image, ImageDraw, ImageFont
+import argparse
 import math
+import sys
 
-def create_gradient(width, height):
-    """Create a gradient image"""
-    img = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Create diagonal gradient
-    for i in range(width + height):
-        progress = i / (width + height)
-        
-        # Interpolate between colors
-        if progress < 0.25:
-            # Pink to blue
-            t = progress / 0.25
-            r = int(232 + (135 - 232) * t)
-            g = int(100 + (156 - 100) * t)
-            b = int(184 + (227 - 184) * t)
-        elif progress < 0.5:
-            # Blue to teal
-            t = (progress - 0.25) / 0.25
-            r = int(135 + (107 - 135) * t)
-            g = int(156 + (191 - 156) * t)
-            b = int(227 + (209 - 227) * t)
-        elif progress < 0.75:
-            # Teal to light green
-            t = (progress - 0.5) / 0.25
-            r = int(107 + (140 - 107) * t)
-            g = int(191 + (209 - 191) * t)
-            b = int(209 + (176 - 209) * t)
-        else:
-            # Light green to yellow/orange
-            t = (progress - 0.75) / 0.25
-            r = int(140 + (240 - 140) * t)
-            g = int(209 + (176 - 209) * t)
-            b = int(176 + (107 - 176) * t)
-        
-        # Draw diagonal line
-        for j in range(3):
-            draw.line([(i - j, 0), (0, i - j)], fill=(r, g, b, 255), width=2)
-    
-    return img
+import numpy as np
+
+import icon_gradient
+import icon_pipeline
+import octopus_geometry
+from icon_cache import cached_icon_set, source_digest
+from icon_gradient import create_gradient
+from icon_parallel import render_sizes
+from icon_pipeline import render_icon_set
 
 def draw_rounded_rectangle(draw, coords, radius, fill=None, outline=None, width=1):
     """Draw a rounded rectangle"""
@@ -74,119 +45,90 @@ def draw_octopus(draw, cx, cy, size):
     dark_green = (51, 77, 64, 255)
     yellow_color = (230, 191, 102, 255)
     
-    # Draw tentacles
-    tentacle_data = [
-        # (start_x, start_y, control1_x, control1_y, control2_x, control2_y, end_x, end_y)
-        (-0.3, 0.1, -0.35, 0.25, -0.38, 0.35, -0.4, 0.4),
-        (-0.15, 0.05, -0.18, 0.2, -0.19, 0.3, -0.2, 0.35),
-        (0.15, 0.05, 0.18, 0.2, 0.19, 0.3, 0.2, 0.35),
-        (0.3, 0.1, 0.35, 0.25, 0.38, 0.35, 0.4, 0.4),
-        (0, 0.15, 0.02, 0.3, 0.01, 0.4, 0, 0.45),
-    ]
-    
-    for i, (sx, sy, c1x, c1y, c2x, c2y, ex, ey) in enumerate(tentacle_data):
-        # Draw tentacle shape
-        points = []
-        for t in range(21):
-            t = t / 20.0
-            # Bezier curve calculation
-            x = (1-t)**3 * (cx + sx*size) + 3*(1-t)**2*t * (cx + c1x*size) + 3*(1-t)*t**2 * (cx + c2x*size) + t**3 * (cx + ex*size)
-            y = (1-t)**3 * (cy + sy*size) + 3*(1-t)**2*t * (cy + c1y*size) + 3*(1-t)*t**2 * (cy + c2y*size) + t**3 * (cy + ey*size)
-            
-            # Vary width along tentacle
-            width = size * 0.08 * (1 - t * 0.5)
-            points.append((x - width/2, y))
-        
-        # Add points for the other side
-        for t in range(20, -1, -1):
-            t = t / 20.0
-            x = (1-t)**3 * (cx + sx*size) + 3*(1-t)**2*t * (cx + c1x*size) + 3*(1-t)*t**2 * (cx + c2x*size) + t**3 * (cx + ex*size)
-            y = (1-t)**3 * (cy + sy*size) + 3*(1-t)**2*t * (cy + c1y*size) + 3*(1-t)*t**2 * (cy + c2y*size) + t**3 * (cy + ey*size)
-            width = size * 0.08 * (1 - t * 0.5)
-            points.append((x + width/2, y))
-        
-        draw.polygon(points, fill=octopus_color, outline=dark_green, width=2)
+    def circle_bbox(x, y, r):
+        # Snapped to whole pixels: PIL rasterizes fractional ellipse boxes
+        # differently depending on where the image starts, so bands of a
+        # tiled render would not line up with an untiled one
+        return [math.floor(cx + (x - r) * size + 0.5), math.floor(cy + (y - r) * size + 0.5),
+                math.floor(cx + (x + r) * size + 0.5), math.floor(cy + (y + r) * size + 0.5)]
+    
+    # Draw tentacles from the shared, pre-tessellated outlines
+    for outline in octopus_geometry.tentacle_outlines(octopus_geometry.tolerance_for(size)):
+        points = np.floor(octopus_geometry.place(outline, cx, cy, size) + 0.5)
+        draw.polygon(points.ravel().tolist(), fill=octopus_color, outline=dark_green, width=2)
     
     # Draw main body
-    body_radius = size * 0.25
-    body_bbox = [cx - body_radius, cy - size * 0.1 - body_radius, 
-                 cx + body_radius, cy - size * 0.1 + body_radius]
-    draw.ellipse(body_bbox, fill=octopus_color, outline=dark_green, width=2)
+    draw.ellipse(circle_bbox(*octopus_geometry.BODY), fill=octopus_color, outline=dark_green, width=2)
     
     # Draw yellow circles on tentacles
-    circle_positions = [
-        (-0.35, 0.25, 0.06),
-        (-0.18, 0.22, 0.05),
-        (0.18, 0.22, 0.05),
-        (0.35, 0.25, 0.06),
-        (0, 0.32, 0.05),
-    ]
-    
-    for cx_off, cy_off, radius in circle_positions:
-        circle_x = cx + cx_off * size
-        circle_y = cy + cy_off * size
-        circle_r = radius * size
-        draw.ellipse([circle_x - circle_r, circle_y - circle_r, 
-                     circle_x + circle_r, circle_y + circle_r], 
-                    fill=yellow_color, outline=dark_green, width=1)
+    for sucker in octopus_geometry.SUCKERS:
+        draw.ellipse(circle_bbox(*sucker), fill=yellow_color, outline=dark_green, width=1)
     
     # Draw face
     # Eyes
-    eye_radius = size * 0.02
-    draw.ellipse([cx - size * 0.08 - eye_radius, cy - size * 0.12 - eye_radius,
-                  cx - size * 0.08 + eye_radius, cy - size * 0.12 + eye_radius],
-                 fill=dark_green)
-    draw.ellipse([cx + size * 0.08 - eye_radius, cy - size * 0.12 - eye_radius,
-                  cx + size * 0.08 + eye_radius, cy - size * 0.12 + eye_radius],
-                 fill=dark_green)
+    for eye in octopus_geometry.EYES:
+        draw.ellipse(circle_bbox(*eye), fill=dark_green)
     
     # Smile
-    smile_bbox = [cx - size * 0.08, cy - size * 0.16, 
-                  cx + size * 0.08, cy]
-    draw.arc(smile_bbox, 0, 180, fill=dark_green, width=int(size * 0.015))
+    x, y, r, start, end, line_width = octopus_geometry.SMILE
+    draw.arc(circle_bbox(x, y, r), start, end, fill=dark_green, width=int(size * line_width))
 
-def create_vibe_icon(filename, size=1024):
-    """Create the Vibe Transcribe icon"""
+def render_vibe_icon(size=1024, region=None):
+    """Render the Vibe Transcribe icon into an RGBA image
+
+    `region` is an optional (x0, y0, x1, y1) box of the size x size icon
+    to render on its own, used to split big sizes across workers.
+    """
+    x0, y0, x1, y1 = region or (0, 0, size, size)
+    
     # Create base image with transparent background
-    img = Image.new('RGBA', (size, size), (255, 255, 255, 0))
+    img = Image.new('RGBA', (x1 - x0, y1 - y0), (255, 255, 255, 0))
     draw = ImageDraw.Draw(img)
     
     # Create gradient for border
-    gradient = create_gradient(size, size)
+    gradient = create_gradient(size, size, region=(x0, y0, x1, y1))
     
     # Create mask for rounded rectangle border
-    mask = Image.new('L', (size, size), 0)
+    mask = Image.new('L', img.size, 0)
     mask_draw = ImageDraw.Draw(mask)
     
     border_width = int(size * 0.04)
     radius = int(size * 0.15)
     
     # Draw outer rounded rectangle on mask
-    draw_rounded_rectangle(mask_draw, [0, 0, size-1, size-1], radius, fill=255)
+    draw_rounded_rectangle(mask_draw, [-x0, -y0, size-1-x0, size-1-y0], radius, fill=255)
     
     # Draw inner rounded rectangle (to create border effect)
-    draw_rounded_rectangle(mask_draw, 
-                          [border_width, border_width, 
-                           size-1-border_width, size-1-border_width], 
-                          radius - border_width, fill=0)
+    inner = [border_width - x0, border_width - y0,
+             size-1-border_width - x0, size-1-border_width - y0]
+    draw_rounded_rectangle(mask_draw, inner, radius - border_width, fill=0)
     
     # Apply gradient through mask
     img.paste(gradient, (0, 0), mask)
     
     # Draw white background inside border
-    draw_rounded_rectangle(draw, 
-                          [border_width, border_width, 
-                           size-1-border_width, size-1-border_width], 
-                          radius - border_width, fill=(255, 255, 255, 255))
+    draw_rounded_rectangle(draw, inner, radius - border_width, fill=(255, 255, 255, 255))
     
     # Draw octopus
-    draw_octopus(draw, size/2, size/2, size * 0.35)
+    draw_octopus(draw, size/2 - x0, size/2 - y0, size * 0.35)
     
-    # Save the image
-    img.save(filename, 'PNG')
+    return img
+
+def create_vibe_icon(filename, size=1024):
+    """Create the Vibe Transcribe icon"""
+    render_vibe_icon(size).save(filename, 'PNG')
     print(f"Icon saved as {filename}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the Vibe Transcribe icon")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="worker processes for rendering (0 = one per core)")
+    parser.add_argument("--direct", action="store_true",
+                        help="render every size directly instead of downsampling one master")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-render instead of using the icon cache")
+    args = parser.parse_args()
+    
     # Create icon in multiple sizes
     sizes = {
         "icon_1024.png": 1024,
@@ -195,5 +137,18 @@ if __name__ == "__main__":
         "icon_128.png": 128,
     }
     
+    def render():
+        if args.direct:
+            return render_sizes(render_vibe_icon, sizes.values(), args.jobs)
+        # Render one supersampled master and downsample it to every size
+        return render_icon_set(
+            lambda size: render_sizes(render_vibe_icon, [size], args.jobs)[size],
+            sizes.values())
+    
+    # Skip rendering entirely when the artwork and sizes are unchanged
+    inputs = (source_digest(sys.modules[__name__], icon_gradient, icon_pipeline, octopus_geometry),
+              "direct" if args.direct else f"mipmap-{icon_pipeline.DEFAULT_SUPERSAMPLE}")
+    images = cached_icon_set("pil", inputs, sizes.values(), render, enabled=not args.no_cache)
     for filename, size in sizes.items():
-        create_vibe_icon(filename, size)
\ No newline at end of file
+        images[size].save(filename, 'PNG')
+        print(f"Icon saved as {filename}")
\ No newline at end of file
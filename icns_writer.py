@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Pure-Python .icns writer for PNG icon payloads
+
+An .icns file is a big-endian container: the 'icns' magic and total
+length, followed by one (OSType, length, data) element per image.
+Modern macOS accepts PNG data for every element type listed below.
+"""
+import io
+import os
+import struct
+
+# OSType code for each entry of a macOS .iconset directory
+ICNS_TYPES = {
+    "icon_16x16.png": b"icp4",
+    "icon_16x16@2x.png": b"ic11",
+    "icon_32x32.png": b"icp5",
+    "icon_32x32@2x.png": b"ic12",
+    "icon_128x128.png": b"ic07",
+    "icon_128x128@2x.png": b"ic13",
+    "icon_256x256.png": b"ic08",
+    "icon_256x256@2x.png": b"ic14",
+    "icon_512x512.png": b"ic09",
+    "icon_512x512@2x.png": b"ic10",
+}
+
+def png_bytes(image):
+    """Encode a PIL image as PNG in memory"""
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def build_icns(elements):
+    """Assemble an .icns container from (ostype, png_data) pairs"""
+    body = b"".join(
+        struct.pack(">4sI", ostype, len(data) + 8) + data
+        for ostype, data in elements
+    )
+    return struct.pack(">4sI", b"icns", len(body) + 8) + body
+
+def write_icns(path, images):
+    """Write {iconset entry name: PIL image} to an .icns file"""
+    elements = [(ICNS_TYPES[name], png_bytes(image)) for name, image in images.items()]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(build_icns(elements))
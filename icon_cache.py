@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for rendered icon sizes
+
+Entries are keyed by a hash of everything that affects the pixels: the
+backend, the size and the source of the modules that draw the icon (the
+SVG template, colors and octopus geometry all live there). Least recently
+used entries are evicted once the cache grows past its size limit.
+
+Usage: python3 icon_cache.py [info|clear|prune] [--limit BYTES]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+
+from PIL import Image
+
+CACHE_DIR = os.environ.get(
+    "VIBE_ICON_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "vibe-transcribe", "icons"))
+
+# Default size limit for the whole cache, in bytes
+CACHE_LIMIT = int(os.environ.get("VIBE_ICON_CACHE_LIMIT", 64 * 1024 * 1024))
+
+def source_digest(*modules):
+    """Hash the source files of the modules that produce an icon"""
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def cache_key(backend, size, *inputs):
+    """Build the content address for one rendered size"""
+    digest = hashlib.sha256()
+    for part in (backend, size, *inputs):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _entry_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.png")
+
+def load(key):
+    """Return the cached image for `key`, or None on a miss"""
+    path = _entry_path(key)
+    try:
+        with Image.open(path) as img:
+            img.load()
+    except (OSError, ValueError):
+        return None
+    # Touch the entry so eviction sees it as recently used
+    os.utime(path)
+    return img
+
+def store(key, image):
+    """Write an image into the cache"""
+    path = _entry_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    image.save(temp_path, 'PNG')
+    os.replace(temp_path, path)
+
+def _entries():
+    entries = []
+    if not os.path.isdir(CACHE_DIR):
+        return entries
+    for shard in os.scandir(CACHE_DIR):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+def evict(limit=CACHE_LIMIT):
+    """Remove least recently used entries until the cache fits in `limit` bytes"""
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+def cached_icon_set(backend, inputs, sizes, render, enabled=True):
+    """Return {size: Image}, calling `render()` only if some size is missing
+
+    `render` takes no arguments and returns images for all of `sizes`, so
+    the output does not depend on which sizes happened to be cached.
+    """
+    if not enabled:
+        return render()
+
+    keys = {size: cache_key(backend, size, *inputs) for size in sizes}
+    images = {size: load(key) for size, key in keys.items()}
+    if all(image is not None for image in images.values()):
+        return images
+
+    images = render()
+    for size, key in keys.items():
+        store(key, images[size])
+    evict()
+    return images
+
+def cache_info():
+    """Summarize the cache contents"""
+    entries = _entries()
+    return {
+        "path": CACHE_DIR,
+        "entries": len(entries),
+        "bytes": sum(size for _, size, _ in entries),
+        "limit": CACHE_LIMIT,
+    }
+
+def clear():
+    """Delete every cached entry"""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear the icon render cache")
+    parser.add_argument("command", nargs="?", default="info", choices=["info", "clear", "prune"])
+    parser.add_argument("--limit", type=int, default=CACHE_LIMIT,
+                        help="size limit in bytes used by prune")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        clear()
+        print(f"🧹 Cleared icon cache at {CACHE_DIR}")
+    elif args.command == "prune":
+        removed = evict(args.limit)
+        print(f"🧹 Evicted {removed} cached icons")
+    else:
+        info = cache_info()
+        print(f"📦 Icon cache: {info['path']}")
+        print(f"   Entries: {info['entries']}")
+        print(f"   Size: {info['bytes'] / 1024:.1f} KiB of {info['limit'] / 1024:.0f} KiB")
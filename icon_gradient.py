@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Shared diagonal gradient used by the icon generators
+"""
+import numpy as np
+from PIL import Image
+
+# Color stops for the Vibe icon border (pink -> blue -> teal -> green -> orange)
+VIBE_GRADIENT_STOPS = [
+    (0.0, (232, 100, 184)),
+    (0.25, (135, 156, 227)),
+    (0.5, (107, 191, 209)),
+    (0.75, (140, 209, 176)),
+    (1.0, (240, 176, 107)),
+]
+
+# Color stops for the placeholder icon drawn by create_icon.py
+PLACEHOLDER_GRADIENT_STOPS = [
+    (0.0, (102, 126, 234)),
+    (0.25, (245, 101, 101)),
+    (0.5, (72, 187, 120)),
+    (0.75, (237, 137, 54)),
+    (1.0, (102, 126, 234)),
+]
+
+def gradient_array(width, height, stops, region=None):
+    """Build a top-left to bottom-right multi-stop gradient as an RGBA array
+
+    `region` is an optional (x0, y0, x1, y1) box; only that part of the
+    width x height gradient is returned.
+    """
+    x0, y0, x1, y1 = region or (0, 0, width, height)
+    offsets = np.array([offset for offset, _ in stops], dtype=np.float64)
+    colors = np.array([color for _, color in stops], dtype=np.float64)
+
+    # Every pixel on the same anti-diagonal shares a color, so interpolate
+    # the width + height - 1 distinct diagonals once and broadcast them
+    progress = np.arange(width + height - 1, dtype=np.float64) / (width + height)
+    diagonals = np.empty((progress.size, 4), dtype=np.uint8)
+    for channel in range(3):
+        diagonals[:, channel] = np.interp(progress, offsets, colors[:, channel])
+    diagonals[:, 3] = 255
+
+    index = np.arange(y0, y1)[:, None] + np.arange(x0, x1)[None, :]
+    return diagonals[index]
+
+def create_gradient(width, height, stops=VIBE_GRADIENT_STOPS, region=None):
+    """Create a diagonal gradient image"""
+    return Image.fromarray(gradient_array(width, height, stops, region), 'RGBA')
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Parallel icon rendering across a process pool
+
+Workers render whole sizes, or horizontal bands of the biggest sizes, and
+write the RGBA pixels straight into a shared-memory buffer owned by the
+parent, so no image data is pickled back through the pool.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from PIL import Image
+
+# Sizes at or above this are split into bands rendered by different workers
+TILE_THRESHOLD = 512
+
+def resolve_jobs(jobs):
+    """Turn a --jobs value into a worker count (0 means one per core)"""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+def plan_tiles(size, jobs):
+    """Split a size into full-width bands, one per worker for big sizes"""
+    bands = min(jobs, size) if size >= TILE_THRESHOLD else 1
+    edges = [size * i // bands for i in range(bands + 1)]
+    return [(0, top, size, bottom) for top, bottom in zip(edges, edges[1:])]
+
+def _render_tile(render, size, region, shm_name):
+    """Render one region and copy its pixels into the shared buffer"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        pixels = render(size, region).tobytes()
+        # Bands span the full width, so each one is a contiguous byte range
+        start = region[1] * size * 4
+        shm.buf[start:start + len(pixels)] = pixels
+    finally:
+        shm.close()
+
+def render_sizes(render, sizes, jobs=1):
+    """Render each size with `render(size, region)` and return {size: Image}
+
+    `render` must be a module-level function returning an RGBA image of
+    the requested (x0, y0, x1, y1) region of a size x size icon.
+    """
+    jobs = resolve_jobs(jobs)
+    sizes = sorted(set(sizes), reverse=True)
+    if jobs == 1:
+        return {size: render(size, None) for size in sizes}
+
+    buffers = {size: shared_memory.SharedMemory(create=True, size=size * size * 4) for size in sizes}
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(_render_tile, render, size, region, buffers[size].name)
+                for size in sizes
+                for region in plan_tiles(size, jobs)
+            ]
+            for future in futures:
+                future.result()
+
+        return {
+            size: Image.frombytes('RGBA', (size, size), bytes(shm.buf[:size * size * 4]))
+            for size, shm in buffers.items()
+        }
+    finally:
+        for shm in buffers.values():
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Render-once pipeline for multi-size icon output
+"""
+from PIL import Image
+
+# Files expected inside a macOS .iconset directory and their pixel sizes
+ICONSET_ENTRIES = [
+    ("icon_16x16.png", 16),
+    ("icon_16x16@2x.png", 32),
+    ("icon_32x32.png", 32),
+    ("icon_32x32@2x.png", 64),
+    ("icon_128x128.png", 128),
+    ("icon_128x128@2x.png", 256),
+    ("icon_256x256.png", 256),
+    ("icon_256x256@2x.png", 512),
+    ("icon_512x512.png", 512),
+    ("icon_512x512@2x.png", 1024),
+]
+
+# Render the master at this multiple of the largest requested size
+DEFAULT_SUPERSAMPLE = 2
+
+def downsample_chain(master, sizes):
+    """Derive every requested size from one master image"""
+    images = {}
+    level = master
+    for size in sorted(set(sizes), reverse=True):
+        # Halve with a box filter while we are at least 2x too large, then
+        # finish with a single Lanczos step from the nearest level
+        while level.width >= 2 * size:
+            level = level.reduce(2)
+        if level.size == (size, size):
+            images[size] = level
+        else:
+            images[size] = level.resize((size, size), Image.LANCZOS)
+    return images
+
+def render_icon_set(render, sizes, supersample=DEFAULT_SUPERSAMPLE):
+    """Render one supersampled master with `render(size)` and downsample it to `sizes`"""
+    master = render(max(sizes) * supersample)
+    return downsample_chain(master, sizes)
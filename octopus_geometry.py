@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Size-independent octopus geometry shared by the cairo and PIL backends
+
+All shapes are in normalized coordinates: the octopus is centered on the
+origin and one unit equals the `size` a backend draws it at, so a backend
+only has to scale and translate. Tentacle outlines are tessellated once
+per tolerance and reused across sizes and backends.
+"""
+import functools
+import math
+
+import numpy as np
+
+# Cubic Bezier control points of each tentacle's center line:
+# (start, control 1, control 2, end)
+TENTACLES = [
+    ((-0.3, 0.1), (-0.35, 0.25), (-0.38, 0.35), (-0.4, 0.4)),
+    ((-0.15, 0.05), (-0.18, 0.2), (-0.19, 0.3), (-0.2, 0.35)),
+    ((0.15, 0.05), (0.18, 0.2), (0.19, 0.3), (0.2, 0.35)),
+    ((0.3, 0.1), (0.35, 0.25), (0.38, 0.35), (0.4, 0.4)),
+    ((0, 0.15), (0.02, 0.3), (0.01, 0.4), (0, 0.45)),
+]
+
+# Tentacle width at its base; it tapers linearly to half of that at the tip
+TENTACLE_WIDTH = 0.08
+
+# Main body circle: (center x, center y, radius)
+BODY = (0, -0.1, 0.25)
+
+# Yellow suckers on the tentacles: (center x, center y, radius)
+SUCKERS = [
+    (-0.35, 0.25, 0.06),
+    (-0.18, 0.22, 0.05),
+    (0.18, 0.22, 0.05),
+    (0.35, 0.25, 0.06),
+    (0, 0.32, 0.05),
+]
+
+# Eyes: (center x, center y, radius)
+EYES = [
+    (-0.08, -0.12, 0.02),
+    (0.08, -0.12, 0.02),
+]
+
+# Smile arc: (center x, center y, radius, start degrees, end degrees, line width)
+SMILE = (0, -0.08, 0.08, 0, 180, 0.015)
+
+# Default flattening tolerance, in pixels
+PIXEL_TOLERANCE = 0.25
+
+# Fewest segments used for any curve, however loose the tolerance
+MIN_SEGMENTS = 4
+
+def tolerance_for(size, pixel_tolerance=PIXEL_TOLERANCE):
+    """Normalized tolerance for drawing at `size`, rounded down to a power of two
+
+    Rounding lets nearby sizes share one cached tessellation while never
+    exceeding the requested pixel error.
+    """
+    return 2.0 ** math.floor(math.log2(pixel_tolerance / size))
+
+def bezier_points(control, segments):
+    """Evaluate a cubic Bezier at segments + 1 evenly spaced parameters"""
+    t = np.linspace(0.0, 1.0, segments + 1)[:, None]
+    u = 1.0 - t
+    basis = np.hstack([u ** 3, 3 * u ** 2 * t, 3 * u * t ** 2, t ** 3])
+    return t[:, 0], basis @ np.asarray(control, dtype=np.float64)
+
+def segments_for(control, tolerance):
+    """Segments needed to keep a flattened cubic within `tolerance`"""
+    p = np.asarray(control, dtype=np.float64)
+    # Uniform subdivision into n chords deviates at most max|B''| / (8 n^2)
+    second = 6 * max(np.hypot(*(p[0] - 2 * p[1] + p[2])), np.hypot(*(p[1] - 2 * p[2] + p[3])))
+    return max(MIN_SEGMENTS, math.ceil(math.sqrt(second / (8 * tolerance))))
+
+@functools.lru_cache(maxsize=None)
+def tentacle_outlines(tolerance):
+    """Closed outline polygons for every tentacle, as (N, 2) arrays"""
+    outlines = []
+    for control in TENTACLES:
+        t, center = bezier_points(control, segments_for(control, tolerance))
+        half_width = (TENTACLE_WIDTH * (1 - t * 0.5) / 2)[:, None]
+        offset = np.hstack([half_width, np.zeros_like(half_width)])
+        # Down the left edge, then back up the right edge
+        outline = np.vstack([center - offset, (center + offset)[::-1]])
+        outline.setflags(write=False)
+        outlines.append(outline)
+    return tuple(outlines)
+
+def place(points, cx, cy, size):
+    """Scale normalized points to `size` and move the origin to (cx, cy)"""
+    return points * size + (cx, cy)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Package Vibe Transcribe for friends as a single compressed archive
+
+The distributable is streamed straight into Vibe-Transcribe-Mac.tar.gz
+without staging a copy of the project. Every tar member is compressed as
+its own gzip member (concatenated gzip members are still a valid .tar.gz)
+and cached by content hash, so a rebuild only compresses files that
+changed. Files with identical content, such as assets shared by the two
+app editions, are stored once and hardlinked inside the archive.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+
+PACKAGE_NAME = "Vibe-Transcribe-Mac"
+ARCHIVE_PATH = f"{PACKAGE_NAME}.tar.gz"
+CACHE_DIR = ".package-cache"
+
+# Project files and directories shipped to friends
+SOURCES = [
+    "public",
+    "server",
+    "scripts",
+    "package.json",
+    "package-lock.json",
+    "README.md",
+    ".gitignore",
+    "transcribe-direct.js",
+    "Vibe Transcribe.app",
+    "Vibe Transcribe - Friend Edition.app",
+]
+
+# Never shipped, wherever they appear
+EXCLUDED_NAMES = {"__pycache__", "node_modules", ".DS_Store", ".build-manifest.json"}
+
+INSTALL_SCRIPT = '''#!/bin/bash
+
+echo "🌈 Installing Vibe Transcribe..."
+
+# Check if Node.js is installed
+if ! command -v node >/dev/null 2>&1; then
+    echo "❌ Node.js is not installed."
+    echo "Please install Node.js from: https://nodejs.org/"
+    echo "Then run this installer again."
+    exit 1
+fi
+
+# Check if Python/pip is available for Whisper
+if ! command -v python3 >/dev/null 2>&1; then
+    echo "❌ Python3 is not installed."
+    echo "Please install Python3, then run: pip3 install openai-whisper"
+    exit 1
+fi
+
+# Check if Whisper is installed
+if ! command -v whisper >/dev/null 2>&1; then
+    echo "⚠️  OpenAI Whisper is not installed."
+    echo "Installing Whisper now..."
+    pip3 install openai-whisper
+    if [ $? -ne 0 ]; then
+        echo "❌ Failed to install Whisper. Please run manually:"
+        echo "pip3 install openai-whisper"
+        exit 1
+    fi
+fi
+
+# Install Node.js dependencies
+echo "📦 Installing dependencies..."
+npm install
+
+if [ $? -eq 0 ]; then
+    echo "✅ Installation complete!"
+    echo ""
+    echo "🎉 Vibe Transcribe is ready to use!"
+    echo ""
+    echo "To start the app:"
+    echo "  • Double-click 'Vibe Transcribe.app'"
+    echo "  OR"
+    echo "  • Run: npm start"
+    echo "  OR"
+    echo "  • Run: ./start.sh"
+    echo ""
+    echo "The app will open at: http://localhost:3000"
+else
+    echo "❌ Installation failed. Please check your internet connection and try again."
+    exit 1
+fi
+'''
+
+START_SCRIPT = '''#!/bin/bash
+
+echo "🌈 Starting Vibe Transcribe..."
+
+# Check if dependencies are installed
+if [ ! -d "node_modules" ]; then
+    echo "Dependencies not found. Running installer first..."
+    ./INSTALL.sh
+    if [ $? -ne 0 ]; then
+        exit 1
+    fi
+fi
+
+# Kill any existing server
+lsof -ti:3000 | xargs kill -9 2>/dev/null
+
+echo "Server starting at: http://localhost:3000"
+echo "Press Ctrl+C to stop"
+
+# Start the server and open browser
+npm start &
+sleep 3
+open http://localhost:3000
+
+# Wait for the server process
+wait
+'''
+
+FRIEND_README = '''# 🌈 Vibe Transcribe App
+
+Welcome to Vibe Transcribe! This is a beautiful audio transcription app that runs locally on your Mac.
+
+## 🚀 Quick Start
+
+### Option 1: Double-click to run (Recommended)
+1. Double-click `Vibe Transcribe.app`
+2. The app will automatically start and open in your browser
+3. Start transcribing! 🎉
+
+### Option 2: Manual installation
+1. Open Terminal and navigate to this folder
+2. Run: `./INSTALL.sh`
+3. Run: `./start.sh` or `npm start`
+
+## ✨ Features
+
+- 🎨 **Beautiful gradient UI** inspired by modern tech brands
+- 🎵 **Drag & drop audio files** (MP3, WAV, M4A, FLAC, etc.)
+- 🧠 **Multiple AI models** (tiny to large-v3)
+- 🌍 **Language detection** or manual selection  
+- 📄 **Export to TXT/PDF**
+- 🔒 **100% local** - no data sent to cloud
+- 🧹 **Auto cleanup** of temporary files
+
+## 📋 Requirements
+
+- macOS 10.13 or later
+- Node.js (will guide you to install if missing)
+- OpenAI Whisper (auto-installed)
+
+## 🆘 Troubleshooting
+
+**App won't start?**
+- Make sure Node.js is installed: https://nodejs.org/
+- Run `./INSTALL.sh` in Terminal
+
+**"Whisper not found" error?**
+- Run: `pip3 install openai-whisper`
+
+**Port 3000 already in use?**
+- Run: `lsof -ti:3000 | xargs kill -9`
+
+## 💝 From Your Friend
+
+This app was built with love and powered by OpenAI Whisper AI. Enjoy transcribing! 
+
+If you have any issues, let me know! 
+'''
+
+# Generated files: archive name -> (content, mode)
+GENERATED = {
+    "INSTALL.sh": (INSTALL_SCRIPT, 0o755),
+    "start.sh": (START_SCRIPT, 0o755),
+    "README_FOR_FRIEND.md": (FRIEND_README, 0o644),
+}
+
+def iter_source_files():
+    """Yield (path on disk, path inside the package) for every shipped file"""
+    for source in SOURCES:
+        if not os.path.exists(source):
+            continue
+        if os.path.isfile(source):
+            yield source, source
+            continue
+        for root, dirs, files in os.walk(source):
+            dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_NAMES)
+            for name in sorted(files):
+                if name not in EXCLUDED_NAMES:
+                    path = os.path.join(root, name)
+                    yield path, path
+
+class PackageCache:
+    """Compressed tar members keyed by content hash, plus file digests by stat"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.blob_dir = os.path.join(cache_dir, "members")
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        try:
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.files = self.manifest.get("files", {})
+        self.used_files = {}
+        self.used_blobs = set()
+
+    def file_digest(self, path):
+        """Content hash of a file, reusing the recorded one if its stat is unchanged"""
+        stat = os.stat(path)
+        recorded = self.files.get(path)
+        if recorded and recorded["size"] == stat.st_size and recorded["mtime_ns"] == stat.st_mtime_ns:
+            digest = recorded["digest"]
+        else:
+            hasher = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+        self.used_files[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest}
+        return digest
+
+    def blob_path(self, key):
+        return os.path.join(self.blob_dir, f"{key}.gz")
+
+    def member(self, header, content_digest, read_data):
+        """Make sure the gzip-compressed tar member for `header` is cached
+
+        Returns (key, compressed) where `compressed` is False on a cache hit.
+        """
+        key = hashlib.sha256(header + content_digest.encode()).hexdigest()
+        self.used_blobs.add(key)
+        blob_path = self.blob_path(key)
+        if os.path.exists(blob_path):
+            return key, False
+
+        data = read_data()
+        padding = b"\0" * (-len(data) % tarfile.BLOCKSIZE)
+        with open(f"{blob_path}.tmp", 'wb') as f:
+            f.write(gzip.compress(header + data + padding, mtime=0))
+        os.replace(f"{blob_path}.tmp", blob_path)
+        return key, True
+
+    def save(self, members):
+        """Record this build and drop blobs it no longer uses"""
+        for name in os.listdir(self.blob_dir):
+            if name.endswith(".gz") and name[:-3] not in self.used_blobs:
+                os.remove(os.path.join(self.blob_dir, name))
+        self.manifest = {"files": self.used_files, "members": members}
+        with open(f"{self.manifest_path}.tmp", 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+def _tar_header(name, size, mode, mtime, linkname=None):
+    info = tarfile.TarInfo(f"{PACKAGE_NAME}/{name}")
+    info.size = size
+    info.mode = mode
+    info.mtime = int(mtime)
+    if linkname:
+        info.type = tarfile.LNKTYPE
+        info.linkname = f"{PACKAGE_NAME}/{linkname}"
+    return info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def build_package(archive_path=ARCHIVE_PATH, cache_dir=CACHE_DIR):
+    """Stream the package into `archive_path`; returns (members, compressed, deduplicated)"""
+    cache = PackageCache(cache_dir)
+    members = []
+    first_by_digest = {}
+    compressed = deduplicated = 0
+
+    entries = []
+    for path, name in iter_source_files():
+        stat = os.stat(path)
+        mode = 0o755 if stat.st_mode & 0o111 else 0o644
+        entries.append((name, cache.file_digest(path), stat.st_size, mode, stat.st_mtime,
+                        lambda path=path: _read_file(path)))
+    generated_mtime = os.stat(__file__).st_mtime
+    for name, (content, mode) in GENERATED.items():
+        data = content.encode('utf-8')
+        entries.append((name, hashlib.sha256(data).hexdigest(), len(data), mode, generated_mtime,
+                        lambda data=data: data))
+
+    for name, digest, size, mode, mtime, read_data in entries:
+        if digest in first_by_digest:
+            # Identical content already in the archive: store a hardlink
+            header = _tar_header(name, 0, mode, mtime, linkname=first_by_digest[digest])
+            key, _ = cache.member(header, "link", lambda: b"")
+            deduplicated += 1
+        else:
+            first_by_digest[digest] = name
+            header = _tar_header(name, size, mode, mtime)
+            key, new = cache.member(header, digest, read_data)
+            compressed += new
+        members.append(key)
+
+    # Nothing changed since the last build and the archive is still there
+    if members == cache.manifest.get("members") and os.path.exists(archive_path):
+        cache.save(members)
+        return len(members), 0, deduplicated
+
+    with open(f"{archive_path}.tmp", 'wb') as archive:
+        for key in members:
+            with open(cache.blob_path(key), 'rb') as blob:
+                shutil.copyfileobj(blob, archive)
+        # Two zero blocks mark the end of the tar stream
+        archive.write(gzip.compress(b"\0" * (2 * tarfile.BLOCKSIZE), mtime=0))
+    os.replace(f"{archive_path}.tmp", archive_path)
+    cache.save(members)
+    return len(members), compressed, deduplicated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Package Vibe Transcribe for a friend")
+    parser.add_argument("--output", default=ARCHIVE_PATH, help="archive to write")
+    args = parser.parse_args()
+
+    print("🌈 Creating Vibe Transcribe package for your friend...")
+    total, compressed, deduplicated = build_package(args.output)
+    print(f"📦 {total} files packaged: {compressed} compressed, "
+          f"{total - compressed - deduplicated} reused, {deduplicated} shared")
+
+    print("✅ Package created successfully!")
+    print("")
+    print("📦 Your friend can use:")
+    print(f"   {args.output}")
+    print("")
+    print("📋 Instructions for your friend:")
+    print(f"   1. Download and extract {args.output}")
+    print("   2. Double-click 'Vibe Transcribe.app' to run")
+    print("   3. If that doesn't work, open Terminal and run './INSTALL.sh'")
+    print("")
+    print("🎉 All done! Your friend will love this app!")
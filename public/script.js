@@ -9,6 +9,10 @@ const languageSelect = document.getElementById('languageSelect');
 
 let currentTranscriptionId = null;
 let pollInterval = null;
+let eventSource = null;
+// Start times of the segments shown while decoding, in order, each with
+// the text node that shows it
+let partialSegments = [];
 
 browseBtn.addEventListener('click', () => fileInput.click());
 
@@ -73,6 +77,7 @@ async function uploadFile(file) {
     
     document.querySelector('.file-name').textContent = file.name;
     document.querySelector('.status').textContent = 'Uploading...';
+    resetPartialText();
     
     try {
         const response = await fetch('/api/upload', {
@@ -87,13 +92,59 @@ async function uploadFile(file) {
         }
         
         currentTranscriptionId = data.transcriptionId;
-        startPolling();
+        watchTranscription();
         
     } catch (error) {
         showError(error.message);
     }
 }
 
+// Follow the job over Server-Sent Events: a snapshot, then only the fields
+// that change. Falls back to polling when the stream is unavailable.
+function watchTranscription() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    let state = {};
+    const source = new EventSource(`/api/events/${currentTranscriptionId}`);
+    eventSource = source;
+
+    const apply = (event) => {
+        // Segments are drawn as they arrive, not kept with the job's state
+        const { segments, ...delta } = JSON.parse(event.data);
+        state = { ...state, ...delta };
+        if (handleStatus(state)) {
+            stopWatching();
+        }
+    };
+    source.addEventListener('snapshot', (event) => {
+        resetPartialText(JSON.parse(event.data).segments);
+        apply(event);
+    });
+    source.addEventListener('update', apply);
+    // New transcript segments, shown while the rest is still decoding
+    source.addEventListener('append', (event) => {
+        const { segments = [] } = JSON.parse(event.data);
+        segments.forEach(addPartialSegment);
+    });
+
+    source.onerror = () => {
+        if (eventSource !== source) return;
+        stopWatching();
+        startPolling();
+    };
+}
+
+function stopWatching() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+    clearInterval(pollInterval);
+}
+
 function startPolling() {
     pollInterval = setInterval(checkStatus, 2000);
     checkStatus();
@@ -110,14 +161,12 @@ async function checkStatus() {
             throw new Error(data.error || 'Status check failed');
         }
         
-        updateProgress(data);
-        
-        if (data.status === 'completed') {
-            clearInterval(pollInterval);
-            showResults(data);
-        } else if (data.status === 'error') {
+        // Polls return every segment so far; redraw only when there are new ones
+        if (data.segments && data.segments.length !== partialSegments.length) {
+            resetPartialText(data.segments);
+        }
+        if (handleStatus(data)) {
             clearInterval(pollInterval);
-            showError(data.error || 'Transcription failed');
         }
         
     } catch (error) {
@@ -126,6 +175,54 @@ async function checkStatus() {
     }
 }
 
+// Show a job's state; returns true once it has finished
+function handleStatus(data) {
+    updateProgress(data);
+    
+    if (data.status === 'completed') {
+        showResults(data);
+        return true;
+    } else if (data.status === 'error') {
+        showError(data.error || 'Transcription failed');
+        return true;
+    }
+    return false;
+}
+
+function resetPartialText(segments = []) {
+    const partialText = document.querySelector('.partial-text');
+    partialText.textContent = '';
+    partialText.classList.add('hidden');
+    partialSegments = [];
+    (segments || []).forEach(addPartialSegment);
+}
+
+// Add one segment's line. Segments of long recordings arrive out of
+// order, so each goes in by start time; only the new line is added.
+function addPartialSegment(segment) {
+    const partialText = document.querySelector('.partial-text');
+    let low = 0;
+    let high = partialSegments.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (partialSegments[middle].start <= segment.start) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+
+    const node = document.createTextNode(`${segment.text}\n`);
+    const next = partialSegments[low];
+    partialText.insertBefore(node, next ? next.node : null);
+    partialSegments.splice(low, 0, { start: segment.start, node });
+
+    partialText.classList.remove('hidden');
+    if (!next) {
+        partialText.scrollTop = partialText.scrollHeight;
+    }
+}
+
 function updateProgress(data) {
     const progressFill = document.querySelector('.progress-fill');
     const progressText = document.querySelector('.progress-text');
@@ -134,7 +231,16 @@ function updateProgress(data) {
     progressFill.style.width = `${data.progress}%`;
     progressText.textContent = `${data.progress}%`;
     
-    if (data.status === 'processing') {
+    if (data.status === 'queued') {
+        const waitSeconds = Math.max(0, Math.round((data.estimatedStartTime - Date.now()) / 1000));
+        status.textContent = data.queuePosition
+            ? `Queued (position ${data.queuePosition}, starting in about ${waitSeconds}s)...`
+            : 'Queued...';
+    } else if (data.status === 'processing' && data.stage === 'loading_model') {
+        status.textContent = `Loading ${data.model} model...`;
+    } else if (data.status === 'processing' && data.realtimeFactor) {
+        status.textContent = `Processing with ${data.model} model (${data.realtimeFactor}x realtime, about ${data.etaSeconds}s left)...`;
+    } else if (data.status === 'processing') {
         status.textContent = `Processing with ${data.model} model...`;
     }
 }
@@ -171,12 +277,14 @@ function hideAll() {
 }
 
 document.querySelector('.new-transcription-btn').addEventListener('click', () => {
+    stopWatching();
     currentTranscriptionId = null;
     hideAll();
     fileInput.value = '';
 });
 
 document.querySelector('.retry-btn').addEventListener('click', () => {
+    stopWatching();
     currentTranscriptionId = null;
     hideAll();
     fileInput.value = '';
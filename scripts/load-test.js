@@ -0,0 +1,324 @@
+#!/usr/bin/env node
+// Load test: N concurrent clients upload synthetic audio to the server,
+// follow each job over /api/events until it completes, then download the
+// TXT. Reports throughput and p50/p95/p99 latency of the upload, the first
+// progress update, completion and the download.
+//
+// By default it starts its own server on a free port with the stub Whisper
+// model (VIBE_WHISPER_STUB=1), so it runs offline and the decode speed is
+// set by --stub-speed; its jobs, uploads and transcripts go in a temporary
+// directory that is removed afterwards. Pass --url to test a running
+// server instead.
+//
+//   node scripts/load-test.js --clients 8 --jobs 64 --audio-seconds 30 --stub-speed 20
+
+const { spawn } = require('child_process');
+const fs = require('fs');
+const net = require('net');
+const os = require('os');
+const path = require('path');
+const { performance } = require('perf_hooks');
+
+const SAMPLE_RATE = 16000;
+const SERVER_SCRIPT = path.join(__dirname, '../server/app.js');
+
+const DEFAULTS = {
+  clients: 4,
+  jobs: 20,
+  audioSeconds: 30,
+  stubSpeed: 20,
+  stubLoadSeconds: 0,
+  workers: 2,
+  model: 'base',
+  // Every job uploads the same audio, so all but the first hit the result cache
+  repeat: false,
+  url: null,
+  json: false
+};
+
+function parseArgs(argv) {
+  const options = { ...DEFAULTS };
+  for (let i = 0; i < argv.length; i++) {
+    const match = /^--([a-z-]+)$/.exec(argv[i]);
+    const key = match && match[1].replace(/-([a-z])/g, (_, letter) => letter.toUpperCase());
+    if (!key || !(key in DEFAULTS)) {
+      throw new Error(`Unknown option: ${argv[i]}`);
+    }
+    if (typeof DEFAULTS[key] === 'boolean') {
+      options[key] = true;
+    } else if (typeof DEFAULTS[key] === 'number') {
+      options[key] = Number(argv[++i]);
+      if (!Number.isFinite(options[key]) || options[key] < 0) {
+        throw new Error(`--${match[1]} takes a number`);
+      }
+    } else {
+      options[key] = argv[++i];
+    }
+  }
+  return options;
+}
+
+// 16kHz mono 16-bit WAV: a tone that changes pitch every second with a
+// short pause between, so the audio looks like speech to the silence
+// detector. Each `seed` gives different audio, and so a distinct upload hash.
+function synthesizeWav(seconds, seed) {
+  const samples = Math.round(seconds * SAMPLE_RATE);
+  const wav = Buffer.alloc(44 + samples * 2);
+  wav.write('RIFF', 0);
+  wav.writeUInt32LE(36 + samples * 2, 4);
+  wav.write('WAVEfmt ', 8);
+  wav.writeUInt32LE(16, 16);
+  wav.writeUInt16LE(1, 20);
+  wav.writeUInt16LE(1, 22);
+  wav.writeUInt32LE(SAMPLE_RATE, 24);
+  wav.writeUInt32LE(SAMPLE_RATE * 2, 28);
+  wav.writeUInt16LE(2, 32);
+  wav.writeUInt16LE(16, 34);
+  wav.write('data', 36);
+  wav.writeUInt32LE(samples * 2, 40);
+
+  for (let i = 0; i < samples; i++) {
+    const second = Math.floor(i / SAMPLE_RATE);
+    const inPause = i % SAMPLE_RATE > SAMPLE_RATE * 0.8;
+    const frequency = 220 + ((seed * 37 + second * 53) % 660);
+    const value = inPause ? 0 : Math.sin(2 * Math.PI * frequency * i / SAMPLE_RATE) * 8000;
+    wav.writeInt16LE(Math.round(value), 44 + i * 2);
+  }
+  return wav;
+}
+
+function freePort() {
+  return new Promise((resolve, reject) => {
+    const server = net.createServer();
+    server.unref();
+    server.on('error', reject);
+    server.listen(0, '127.0.0.1', () => {
+      const { port } = server.address();
+      server.close(() => resolve(port));
+    });
+  });
+}
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+async function startServer(options) {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'vibe-load-'));
+  const port = await freePort();
+  const logPath = path.join(dir, 'server.log');
+  const log = fs.openSync(logPath, 'w');
+  const child = spawn(process.execPath, [SERVER_SCRIPT], {
+    env: {
+      ...process.env,
+      PORT: String(port),
+      VIBE_WHISPER_STUB: '1',
+      VIBE_STUB_SPEED: String(options.stubSpeed),
+      VIBE_STUB_LOAD_SECONDS: String(options.stubLoadSeconds),
+      WHISPER_WORKERS: String(options.workers),
+      VIBE_MAX_QUEUE: process.env.VIBE_MAX_QUEUE || String(Math.max(50, options.jobs)),
+      VIBE_DATA_DIR: path.join(dir, 'data'),
+      VIBE_RESULT_CACHE: path.join(dir, 'cache'),
+      VIBE_UPLOAD_DIR: path.join(dir, 'uploads'),
+      VIBE_TRANSCRIPTS_DIR: path.join(dir, 'transcriptions')
+    },
+    stdio: ['ignore', log, log]
+  });
+
+  const url = `http://127.0.0.1:${port}`;
+  const stop = async () => {
+    child.kill();
+    await new Promise(resolve => (child.exitCode === null ? child.once('exit', resolve) : resolve()));
+    fs.closeSync(log);
+    fs.rmSync(dir, { recursive: true, force: true });
+  };
+
+  const deadline = Date.now() + 30000;
+  while (Date.now() < deadline) {
+    if (child.exitCode !== null) {
+      break;
+    }
+    try {
+      if ((await fetch(`${url}/api/stats`)).ok) {
+        return { url, stop };
+      }
+    } catch (error) {
+      // Not listening yet
+    }
+    await sleep(200);
+  }
+
+  const output = fs.readFileSync(logPath, 'utf-8');
+  await stop();
+  throw new Error(`Server did not start:\n${output.slice(-2000)}`);
+}
+
+// Read a Server-Sent Events response, calling onEvent(event, data) for
+// each event until onEvent returns true or the stream ends
+async function readEvents(response, onEvent) {
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for await (const chunk of response.body) {
+    buffer += decoder.decode(chunk, { stream: true });
+    let end;
+    while ((end = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let event = 'message';
+      const data = [];
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) {
+          event = line.slice(7);
+        } else if (line.startsWith('data: ')) {
+          data.push(line.slice(6));
+        }
+      }
+      if (data.length && onEvent(event, JSON.parse(data.join('\n')))) {
+        return;
+      }
+    }
+  }
+}
+
+// One job from upload to download; latencies are in seconds from the
+// start of the upload, except the download, which is timed on its own
+async function runJob(url, index, options) {
+  const audio = synthesizeWav(options.audioSeconds, options.repeat ? 0 : index);
+  const form = new FormData();
+  form.append('audio', new Blob([audio], { type: 'audio/wav' }), `load-test-${index}.wav`);
+  form.append('model', options.model);
+
+  const started = performance.now();
+  const since = from => (performance.now() - from) / 1000;
+  const response = await fetch(`${url}/api/upload`, { method: 'POST', body: form });
+  const record = { upload: since(started) };
+  if (response.status === 503) {
+    await response.body.cancel();
+    return { ...record, outcome: 'rejected' };
+  }
+  const body = await response.json();
+  if (!response.ok) {
+    return { ...record, outcome: 'failed', error: body.error };
+  }
+
+  const id = body.transcriptionId;
+  let status = null;
+  const events = await fetch(`${url}/api/events/${id}`);
+  await readEvents(events, (event, data) => {
+    if (record.firstProgress === undefined
+      && (data.progress > 0 || (data.segments && data.segments.length) || data.status === 'completed')) {
+      record.firstProgress = since(started);
+    }
+    status = data.status || status;
+    return status === 'completed' || status === 'error';
+  });
+  await events.body.cancel().catch(() => {});
+  if (status !== 'completed' && status !== 'error') {
+    // The stream closed early; ask once more
+    status = (await (await fetch(`${url}/api/status/${id}`)).json()).status;
+  }
+  record.completion = since(started);
+  if (status !== 'completed') {
+    return { ...record, outcome: 'failed', error: `job ended as ${status}` };
+  }
+
+  const downloadStarted = performance.now();
+  const download = await fetch(`${url}/api/download/${id}/txt`);
+  await download.arrayBuffer();
+  record.download = since(downloadStarted);
+  return { ...record, outcome: download.ok ? 'completed' : 'failed' };
+}
+
+// Nearest-rank percentile of sorted values
+function percentile(sorted, p) {
+  if (sorted.length === 0) {
+    return null;
+  }
+  return sorted[Math.min(sorted.length - 1, Math.ceil(p / 100 * sorted.length) - 1)];
+}
+
+function summarize(records, elapsed, options) {
+  const count = outcome => records.filter(record => record.outcome === outcome).length;
+  const completed = count('completed');
+  const latency = {};
+  for (const key of ['upload', 'firstProgress', 'completion', 'download']) {
+    const values = records.map(record => record[key]).filter(value => value !== undefined).sort((a, b) => a - b);
+    latency[key] = {
+      p50: percentile(values, 50),
+      p95: percentile(values, 95),
+      p99: percentile(values, 99),
+      max: values.length ? values[values.length - 1] : null
+    };
+  }
+  return {
+    options,
+    elapsedSeconds: elapsed,
+    jobs: { completed, failed: count('failed'), rejected: count('rejected') },
+    throughput: {
+      jobsPerSecond: completed / elapsed,
+      audioSecondsPerSecond: completed * options.audioSeconds / elapsed
+    },
+    latency,
+    errors: [...new Set(records.filter(record => record.error).map(record => record.error))]
+  };
+}
+
+function printSummary(summary) {
+  const { jobs, throughput, latency } = summary;
+  const format = seconds => (seconds === null ? '-' : seconds < 1 ? `${Math.round(seconds * 1000)}ms` : `${seconds.toFixed(2)}s`);
+  console.log(`Jobs: ${jobs.completed} completed, ${jobs.failed} failed, ${jobs.rejected} rejected (503) `
+    + `in ${summary.elapsedSeconds.toFixed(1)}s`);
+  console.log(`Throughput: ${throughput.jobsPerSecond.toFixed(2)} jobs/s, `
+    + `${throughput.audioSecondsPerSecond.toFixed(1)}s of audio/s`);
+  console.log();
+  console.log(`${''.padEnd(16)}${['p50', 'p95', 'p99', 'max'].map(name => name.padStart(10)).join('')}`);
+  const labels = { upload: 'upload', firstProgress: 'first progress', completion: 'completion', download: 'download' };
+  for (const [key, label] of Object.entries(labels)) {
+    const row = latency[key];
+    console.log(`${label.padEnd(16)}${['p50', 'p95', 'p99', 'max'].map(name => format(row[name]).padStart(10)).join('')}`);
+  }
+  for (const error of summary.errors) {
+    console.log(`Error: ${error}`);
+  }
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+  const server = options.url ? { url: options.url.replace(/\/$/, ''), stop: async () => {} } : await startServer(options);
+
+  if (!options.json) {
+    console.log(`${options.clients} clients, ${options.jobs} jobs of ${options.audioSeconds}s audio against ${server.url}`
+      + (options.url ? '' : ` (stub Whisper at ${options.stubSpeed}x realtime, ${options.workers} workers)`));
+  }
+
+  const records = [];
+  let next = 0;
+  const client = async () => {
+    while (next < options.jobs) {
+      const index = next++;
+      try {
+        records.push(await runJob(server.url, index, options));
+      } catch (error) {
+        records.push({ outcome: 'failed', error: error.message });
+      }
+    }
+  };
+
+  const started = performance.now();
+  try {
+    await Promise.all(Array.from({ length: Math.max(1, options.clients) }, client));
+  } finally {
+    await server.stop();
+  }
+
+  const summary = summarize(records, (performance.now() - started) / 1000, options);
+  if (options.json) {
+    console.log(JSON.stringify(summary, null, 2));
+  } else {
+    printSummary(summary);
+  }
+  process.exitCode = summary.jobs.failed > 0 ? 1 : 0;
+}
+
+main().catch((error) => {
+  console.error(error.message);
+  process.exit(1);
+});
@@ -4,39 +4,57 @@ const cors = require('cors');
 const path = require('path');
 const fs = require('fs');
 const fsPromises = require('fs').promises;
-const { spawn } = require('child_process');
 const { v4: uuidv4 } = require('uuid');
 const PDFDocument = require('pdfkit');
+const { Scheduler } = require('./scheduler');
+const { IngestStorage } = require('./ingest-storage');
+const { ResultCache } = require('./result-cache');
+const { isLongAudio, transcribeLong } = require('./long-audio');
+const { JobStore, FINISHED } = require('./job-store');
+const { TranscriptStore } = require('./transcript-store');
+const { isTarArchive, extractTar, writeTarGz } = require('./tar');
+const { registry, metrics, StageTimer } = require('./metrics');
 
 const app = express();
 const PORT = process.env.PORT || 3000;
+const MAX_UPLOAD_BYTES = 100 * 1024 * 1024; // 100MB
+const UPLOAD_DIR = process.env.VIBE_UPLOAD_DIR || path.join(__dirname, '../uploads');
+
+// Batches: files per batch, unpacked audio per batch, and items of one
+// batch transcribed at a time
+const MAX_BATCH_FILES = 100;
+const MAX_BATCH_BYTES = 1024 * 1024 * 1024;
+const BATCH_CONCURRENCY = Number(process.env.VIBE_BATCH_CONCURRENCY) || 1;
+
+const AUDIO_TYPES = /mp3|wav|m4a|flac|ogg|webm|mp4|mpeg|mpga|oga|opus/;
+
+function isAudioFile(name, mimetype = '') {
+  return AUDIO_TYPES.test(path.extname(name).toLowerCase()) || AUDIO_TYPES.test(mimetype);
+}
 
 app.use(cors());
 app.use(express.json());
 app.use(express.static(path.join(__dirname, '../public')));
 
-const storage = multer.diskStorage({
-  destination: async (req, file, cb) => {
-    const uploadDir = path.join(__dirname, '../uploads');
-    await fsPromises.mkdir(uploadDir, { recursive: true });
-    cb(null, uploadDir);
+// Hashes uploads as they stream in, so repeats hit the result cache, and
+// decodes them to 16kHz mono PCM on the way to disk
+const storage = new IngestStorage({
+  destination: async () => {
+    await fsPromises.mkdir(UPLOAD_DIR, { recursive: true });
+    return UPLOAD_DIR;
   },
-  filename: (req, file, cb) => {
+  filename: (req, file) => {
     const uniqueId = uuidv4();
     const ext = path.extname(file.originalname);
-    cb(null, `${uniqueId}${ext}`);
+    return `${uniqueId}${ext}`;
   }
 });
 
 const upload = multer({
   storage,
-  limits: { fileSize: 100 * 1024 * 1024 }, // 100MB
+  limits: { fileSize: MAX_UPLOAD_BYTES },
   fileFilter: (req, file, cb) => {
-    const allowedTypes = /mp3|wav|m4a|flac|ogg|webm|mp4|mpeg|mpga|oga|opus/;
-    const extname = allowedTypes.test(path.extname(file.originalname).toLowerCase());
-    const mimetype = allowedTypes.test(file.mimetype);
-    
-    if (extname || mimetype) {
+    if (isAudioFile(file.originalname, file.mimetype)) {
       return cb(null, true);
     } else {
       cb(new Error('Invalid file type. Only audio files are allowed.'));
@@ -44,7 +62,27 @@ const upload = multer({
   }
 });
 
-const transcriptions = new Map();
+const batchUpload = multer({
+  storage,
+  limits: { fileSize: MAX_UPLOAD_BYTES, files: MAX_BATCH_FILES },
+  fileFilter: (req, file, cb) => {
+    if (isAudioFile(file.originalname, file.mimetype) || isTarArchive(file.originalname)) {
+      return cb(null, true);
+    } else {
+      cb(new Error('Invalid file type. Only audio files and tar archives are allowed.'));
+    }
+  }
+});
+
+const transcriptions = new JobStore();
+const batches = new JobStore({ name: 'batches' });
+const transcripts = new TranscriptStore();
+const scheduler = new Scheduler();
+const resultCache = new ResultCache();
+// Cache key -> promise settled when the latest job for that key finishes,
+// so a repeat upload waits for it instead of transcribing the same audio
+// twice
+const pendingResults = new Map();
 
 app.post('/api/upload', upload.single('audio'), async (req, res) => {
   try {
@@ -52,20 +90,19 @@ app.post('/api/upload', upload.single('audio'), async (req, res) => {
       return res.status(400).json({ error: 'No file uploaded' });
     }
 
+    if (scheduler.queueFull) {
+      await fsPromises.unlink(req.file.path).catch(() => {});
+      res.set('Retry-After', '30');
+      return res.status(503).json({ error: 'Server is busy, please try again in a moment' });
+    }
+
     const { model = 'base', language = 'auto' } = req.body;
-    const transcriptionId = uuidv4();
-    
-    transcriptions.set(transcriptionId, {
-      id: transcriptionId,
-      filename: req.file.originalname,
-      status: 'processing',
-      progress: 0,
-      model,
-      language,
-      startTime: Date.now()
-    });
+    const transcriptionId = createTranscription(req.file, model, language);
+    // Counted towards the queue limit from now on, before the cache lookup
+    // and anything else that is awaited on the way to the scheduler
+    scheduler.hold([{ id: transcriptionId, model, size: req.file.size }]);
 
-    processTranscription(transcriptionId, req.file.path, model, language);
+    processTranscription(transcriptionId, req.file, model, language);
 
     res.json({ 
       transcriptionId,
@@ -76,14 +113,325 @@ app.post('/api/upload', upload.single('audio'), async (req, res) => {
   }
 });
 
-app.get('/api/status/:id', (req, res) => {
+// The upload is recorded with the job so it can be run again after a crash
+function createTranscription(file, model, language, batchId) {
+  const { path: audioPath, size, hash } = file;
+  const transcription = transcriptions.create({
+    id: uuidv4(),
+    filename: file.originalname,
+    status: 'queued',
+    progress: 0,
+    segments: [],
+    model,
+    language,
+    audio: { path: audioPath, size, hash },
+    batchId,
+    startTime: Date.now()
+  });
+  return transcription.id;
+}
+
+// Many files, or tar archives of them, transcribed as one batch with one
+// model. Items run BATCH_CONCURRENCY at a time, and the scheduler keeps
+// sending them to the worker that already has the model loaded, so a
+// batch pays for one model load instead of one per file.
+app.post('/api/batch', batchUpload.array('audio', MAX_BATCH_FILES), async (req, res) => {
+  const files = [];
+  try {
+    for (const file of req.files || []) {
+      if (!isTarArchive(file.originalname)) {
+        files.push(file);
+        continue;
+      }
+      try {
+        files.push(...await extractTar(file.path, path.dirname(file.path), {
+          accept: name => isAudioFile(name) && !path.basename(name).startsWith('.'),
+          filename: name => `${uuidv4()}${path.extname(name)}`,
+          maxBytes: MAX_BATCH_BYTES
+        }));
+      } finally {
+        await fsPromises.unlink(file.path).catch(() => {});
+      }
+    }
+
+    const empty = files.filter(file => file.size === 0);
+    await Promise.all(empty.map(file => fsPromises.unlink(file.path).catch(() => {})));
+    const audio = files.filter(file => file.size > 0);
+
+    if (audio.length === 0 || audio.length > MAX_BATCH_FILES) {
+      await Promise.all(audio.map(file => fsPromises.unlink(file.path).catch(() => {})));
+      return res.status(400).json({
+        error: audio.length ? `A batch can hold at most ${MAX_BATCH_FILES} files` : 'No audio files uploaded'
+      });
+    }
+
+    // Every file of the batch counts towards the queue limit
+    if (!scheduler.hasRoom(audio.length)) {
+      await Promise.all(audio.map(file => fsPromises.unlink(file.path).catch(() => {})));
+      if (audio.length > scheduler.maxQueue) {
+        return res.status(400).json({
+          error: `This server queues at most ${scheduler.maxQueue} files; split the batch into smaller ones`
+        });
+      }
+      res.set('Retry-After', '30');
+      return res.status(503).json({ error: 'Server is busy, please try again in a moment' });
+    }
+
+    const { model = 'base', language = 'auto' } = req.body;
+    const batchId = uuidv4();
+    const items = audio.map(file => ({
+      id: createTranscription(file, model, language, batchId),
+      file,
+      model,
+      language
+    }));
+    batches.create({ id: batchId, items: items.map(item => item.id), model, language, startTime: Date.now() });
+
+    runBatch(items);
+
+    res.json({
+      batchId,
+      transcriptions: items.map(item => ({ transcriptionId: item.id, filename: item.file.originalname })),
+      message: `${items.length} files uploaded successfully, transcription started`
+    });
+  } catch (error) {
+    await Promise.all(files.map(file => fsPromises.unlink(file.path).catch(() => {})));
+    res.status(500).json({ error: error.message });
+  }
+});
+
+app.get('/api/batch/:id', (req, res) => {
+  const batch = batches.get(req.params.id);
+
+  if (!batch) {
+    return res.status(404).json({ error: 'Batch not found' });
+  }
+
+  res.json(batchView(batch));
+});
+
+// All finished transcripts of a batch as one .tar.gz, named after the files
+app.get('/api/batch/:id/download', async (req, res) => {
+  const batch = batches.get(req.params.id);
+  const completed = batch
+    ? batch.items.map(id => transcriptions.get(id)).filter(item => item && item.status === 'completed')
+    : [];
+
+  if (completed.length === 0) {
+    return res.status(404).json({ error: 'Batch not found or no transcriptions completed yet' });
+  }
+
+  const used = new Set();
+  const entries = completed.map((transcription) => {
+    const base = path.parse(transcription.filename).name || 'transcription';
+    let name = `${base}.txt`;
+    for (let copy = 2; used.has(name); copy++) {
+      name = `${base} (${copy}).txt`;
+    }
+    used.add(name);
+    return { name, load: () => readTranscript(transcription.id) };
+  });
+
+  res.attachment(`transcriptions_${batch.id}.tar.gz`);
+  try {
+    await writeTarGz(res, entries);
+  } catch (error) {
+    res.destroy(error);
+  }
+});
+
+// Aggregate state of a batch; progress is weighted by file size
+function batchView(batch) {
+  const items = batch.items.map(id => transcriptions.get(id)).filter(Boolean);
+  const counts = { queued: 0, processing: 0, completed: 0, error: 0 };
+  let weighted = 0;
+  let total = 0;
+  for (const item of items) {
+    counts[item.status] = (counts[item.status] || 0) + 1;
+    const size = item.audio.size || 1;
+    const progress = item.progress ?? (FINISHED.includes(item.status) ? 100 : 0);
+    weighted += progress * size;
+    total += size;
+  }
+
+  let status = 'queued';
+  if (counts.completed + counts.error === items.length) {
+    status = 'completed';
+  } else if (counts.processing > 0 || counts.completed + counts.error > 0) {
+    status = 'processing';
+  }
+
+  return {
+    id: batch.id,
+    status,
+    model: batch.model,
+    language: batch.language,
+    total: items.length,
+    ...counts,
+    progress: total ? Math.floor(weighted / total) : 0,
+    transcriptions: items.map(item => ({
+      transcriptionId: item.id,
+      filename: item.filename,
+      status: item.status,
+      progress: item.progress ?? (item.status === 'completed' ? 100 : 0),
+      error: item.error
+    }))
+  };
+}
+
+// Run a batch's items at most BATCH_CONCURRENCY at a time. Items not
+// started yet are held by the scheduler, so they count towards the queue
+// limit and have a queue position.
+async function runBatch(items) {
+  scheduler.hold(items.map(({ id, file, model }) => ({ id, model, size: file.size })));
+  const waiting = [...items];
+  const runners = Array.from({ length: Math.min(BATCH_CONCURRENCY, waiting.length) }, async () => {
+    while (waiting.length > 0) {
+      const { id, file, model, language } = waiting.shift();
+      await processTranscription(id, file, model, language);
+    }
+  });
+  await Promise.all(runners);
+}
+
+// What clients see of a job. Transcripts are not kept in memory, so the
+// text of a completed job is read back from its file.
+async function publicView(transcription) {
+  const { audio, cacheKey, ...view } = transcription;
+  // Progress is not journaled, so jobs loaded after a restart have none
+  view.progress = view.progress ?? (transcription.status === 'completed' ? 100 : 0);
+  if (transcription.status === 'queued') {
+    Object.assign(view, scheduler.position(transcription.id));
+  } else if (transcription.status === 'completed') {
+    view.text = await readTranscript(transcription.id);
+  }
+  return view;
+}
+
+async function readTranscript(id) {
+  return (await transcripts.read(id, 'txt')) ?? '';
+}
+
+app.get('/api/status/:id', async (req, res) => {
   const transcription = transcriptions.get(req.params.id);
   
   if (!transcription) {
     return res.status(404).json({ error: 'Transcription not found' });
   }
 
-  res.json(transcription);
+  res.json(await publicView(transcription));
+});
+
+// Server-Sent Events stream of a job: a snapshot first, then only the
+// fields that change ('update') and each new transcript segment
+// ('append'), until the job completes or fails. Clients that
+// cannot use it poll /api/status/:id instead.
+app.get('/api/events/:id', async (req, res) => {
+  const { id } = req.params;
+  const transcription = transcriptions.get(id);
+
+  if (!transcription) {
+    return res.status(404).json({ error: 'Transcription not found' });
+  }
+
+  res.set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    Connection: 'keep-alive'
+  });
+  res.flushHeaders();
+
+  const send = (event, data) => res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+  const finished = () => FINISHED.includes(transcription.status);
+
+  // Registered before anything is awaited, so a client that leaves early
+  // never leaves the listener or the heartbeat behind
+  let heartbeat = null;
+  let closed = false;
+  const close = () => {
+    closed = true;
+    clearInterval(heartbeat);
+    transcriptions.off(id, onChange);
+  };
+  req.on('close', close);
+
+  const onChange = async (delta, kind) => {
+    if (finished()) {
+      close();
+      if (transcription.status === 'completed') {
+        delta = { ...delta, text: await readTranscript(id) };
+      }
+      send(kind, delta);
+      res.end();
+      return;
+    }
+    send(kind, delta);
+  };
+
+  send('snapshot', await publicView(transcription));
+  if (closed) {
+    return;
+  }
+  if (finished()) {
+    close();
+    return res.end();
+  }
+
+  // Comments keep proxies from closing an idle stream
+  heartbeat = setInterval(() => res.write(': ping\n\n'), 15000);
+  transcriptions.on(id, onChange);
+});
+
+// Queue positions move whenever jobs start; push them to waiting clients
+scheduler.on('dispatch', () => {
+  for (const transcription of transcriptions.withStatus('queued')) {
+    transcriptions.update(transcription.id, scheduler.position(transcription.id) || {});
+  }
+});
+
+// Finished jobs expire after VIBE_JOB_TTL_HOURS or once there are more than
+// VIBE_MAX_JOBS of them; their files go with them
+transcriptions.on('evict', (transcription) => {
+  transcripts.remove(transcription.id, ['txt', 'pdf']).catch(() => {});
+  // A batch goes once the last of its transcriptions has
+  const batch = transcription.batchId && batches.get(transcription.batchId);
+  if (batch && !batch.items.some(id => transcriptions.get(id))) {
+    batches.delete(batch.id);
+  }
+});
+setInterval(() => transcriptions.evict(), 60 * 1000).unref();
+
+// Live state, read when /metrics is scraped
+registry.gauge('vibe_queue_depth', 'Jobs waiting for a worker', () => scheduler.queue.length);
+registry.gauge('vibe_active_jobs', 'Jobs running on a worker', () => scheduler.running.size);
+registry.gauge('vibe_jobs', 'Transcription jobs held, by status',
+  () => Object.entries(transcriptions.counts()).map(([status, count]) => [{ status }, count]));
+registry.counter('vibe_result_cache_lookups_total', 'Result cache lookups',
+  () => [[{ result: 'hit' }, resultCache.hits], [{ result: 'miss' }, resultCache.misses]]);
+registry.gauge('vibe_result_cache_hit_ratio', 'Share of result cache lookups that hit',
+  () => resultCache.stats().hitRate);
+registry.counter('vibe_model_cache_lookups_total', 'Loaded-model lookups across workers', () => {
+  const sum = key => scheduler.workers.reduce((total, worker) => total + worker.cache[key], 0);
+  return [[{ result: 'hit' }, sum('hits')], [{ result: 'miss' }, sum('misses')]];
+});
+registry.gauge('vibe_model_cache_hit_ratio', 'Share of jobs that found their model loaded', () => {
+  const hits = scheduler.workers.reduce((total, worker) => total + worker.cache.hits, 0);
+  const lookups = scheduler.workers.reduce((total, worker) => total + worker.cache.hits + worker.cache.misses, 0);
+  return lookups ? hits / lookups : 0;
+});
+
+app.get('/metrics', (req, res) => {
+  res.type('text/plain; version=0.0.4; charset=utf-8');
+  res.send(registry.render());
+});
+
+app.get('/api/stats', (req, res) => {
+  res.json({
+    ...scheduler.stats(),
+    resultCache: resultCache.stats(),
+    jobs: transcriptions.stats(),
+    batches: batches.jobs.size
+  });
 });
 
 app.get('/api/download/:id/:format', async (req, res) => {
@@ -94,136 +442,242 @@ app.get('/api/download/:id/:format', async (req, res) => {
     return res.status(404).json({ error: 'Transcription not found or not completed' });
   }
 
-  const transcriptionDir = path.join(__dirname, '../transcriptions');
-  
   if (format === 'txt') {
-    const txtPath = path.join(transcriptionDir, `${id}.txt`);
-    res.download(txtPath, `transcription_${transcription.filename}.txt`);
+    // Stored compressed when large; sent decompressed as it is read
+    const stream = await transcripts.createReadStream(id, 'txt');
+    if (!stream) {
+      return res.status(404).json({ error: 'Transcription file not found' });
+    }
+    res.attachment(`transcription_${transcription.filename}.txt`);
+    res.type('text/plain; charset=utf-8');
+    stream.on('error', () => res.destroy());
+    stream.pipe(res);
   } else if (format === 'pdf') {
-    const pdfPath = path.join(transcriptionDir, `${id}.pdf`);
-    res.download(pdfPath, `transcription_${transcription.filename}.pdf`);
+    const pdfPath = transcripts.pathFor(id, 'pdf');
+    const filename = `transcription_${transcription.filename}.pdf`;
+    try {
+      await fsPromises.access(pdfPath);
+      res.download(pdfPath, filename);
+    } catch (error) {
+      // First download: render into the response and keep the file
+      res.attachment(filename);
+      await exportPDF(transcription, pdfPath, res);
+    }
   } else {
     res.status(400).json({ error: 'Invalid format' });
   }
 });
 
-async function processTranscription(id, audioPath, model, language) {
-  const transcription = transcriptions.get(id);
-  const transcriptionDir = path.join(__dirname, '../transcriptions');
-  await fsPromises.mkdir(transcriptionDir, { recursive: true });
+// Run an admitted job (one the scheduler holds) to completion; it leaves
+// the held list when it reaches the scheduler, or here when it never does
+async function processTranscription(id, file, model, language) {
+  const audioPath = file.path;
+  const pdfPath = transcripts.pathFor(id, 'pdf');
+  const cacheKey = ResultCache.key(file.hash, model, language);
+  transcriptions.update(id, { cacheKey });
+  const timer = new StageTimer('cache_lookup');
+  let cached = false;
+
+  // Same audio already transcribed (or being transcribed) with the same
+  // model and language: reuse its transcript and any cached exports. The
+  // key is claimed before anything is awaited, so of several identical
+  // uploads arriving together only the first transcribes; each waits for
+  // the one before it and then finds the result in the cache.
+  const earlier = pendingResults.get(cacheKey);
+  let settle;
+  const claim = new Promise(resolve => { settle = resolve; });
+  pendingResults.set(cacheKey, claim);
 
   try {
-    const outputPath = path.join(transcriptionDir, `${id}.txt`);
-    
-    const args = [audioPath, '--model', model, '--output_format', 'txt', '--output_dir', transcriptionDir];
-    
-    if (language !== 'auto') {
-      args.push('--language', language);
-    }
-
-    const whisperProcess = spawn('whisper', args);
-    
-    let stderr = '';
-    
-    whisperProcess.stderr.on('data', (data) => {
-      stderr += data.toString();
-      console.log('Whisper stderr:', data.toString());
-      
-      // Whisper doesn't output percentage progress, so we'll simulate it
-      // based on detected language and processing stages
-      if (stderr.includes('Detecting language')) {
-        transcription.progress = 10;
-        transcriptions.set(id, transcription);
-      } else if (stderr.includes('Detected language')) {
-        transcription.progress = 20;
-        transcriptions.set(id, transcription);
-      } else if (transcription.progress < 90) {
-        // Gradually increase progress during processing
-        transcription.progress = Math.min(90, transcription.progress + 5);
-        transcriptions.set(id, transcription);
-      }
+    await fsPromises.mkdir(path.dirname(pdfPath), { recursive: true });
+
+    if (earlier) {
+      timer.enter('duplicate_wait');
+      await earlier;
+      timer.enter('cache_lookup');
+    }
+    const cachedText = await resultCache.restore(cacheKey, { pdf: pdfPath });
+    cached = cachedText !== null;
+
+    if (cached) {
+      await transcripts.write(id, 'txt', cachedText);
+    } else {
+      const text = await transcribe(id, file, model, language, timer);
+      // Stored before the claim is settled, so waiting duplicates find it
+      await resultCache.store(cacheKey, { txt: text }).catch((error) => {
+        console.error('Error caching transcription:', error);
+      });
+    }
+
+    // Clients get the text from the file; only metadata stays in memory
+    transcriptions.update(id, {
+      status: 'completed',
+      progress: 100,
+      etaSeconds: 0,
+      segments: null,
+      cached,
+      timings: finishTimings(timer, 'completed', cached),
+      endTime: Date.now()
     });
-    
-    whisperProcess.stdout.on('data', (data) => {
-      console.log('Whisper stdout:', data.toString());
-      // Update progress as we receive output
-      if (transcription.progress < 80) {
-        transcription.progress = Math.min(80, transcription.progress + 10);
-        transcriptions.set(id, transcription);
-      }
+  } catch (error) {
+    transcriptions.update(id, {
+      status: 'error',
+      error: error.message,
+      segments: null,
+      timings: finishTimings(timer, 'error', cached),
+      endTime: Date.now()
     });
+  } finally {
+    // Cached and failed jobs never reach the scheduler
+    scheduler.release(id);
+    settle();
+    if (pendingResults.get(cacheKey) === claim) {
+      pendingResults.delete(cacheKey);
+    }
+  }
+
+  setTimeout(async () => {
+    try {
+      await fsPromises.unlink(audioPath);
+    } catch (error) {
+      console.error('Error cleaning up audio file:', error);
+    }
+  }, 5000);
+}
+
+// Seconds per stage for the job record, also recorded in the metrics
+function finishTimings(timer, status, cached) {
+  const timings = {};
+  for (const [stage, seconds] of Object.entries(timer.finish())) {
+    timings[stage] = Math.round(seconds * 1000) / 1000;
+    metrics.stageSeconds.observe({ stage }, seconds);
+  }
+  metrics.jobs.inc({ status, cached: String(cached) });
+  return timings;
+}
 
-    whisperProcess.on('close', async (code) => {
-      if (code === 0) {
-        try {
-          const files = await fsPromises.readdir(transcriptionDir);
-          const txtFile = files.find(f => f.startsWith(path.basename(audioPath, path.extname(audioPath))) && f.endsWith('.txt'));
-          
-          if (txtFile) {
-            const oldPath = path.join(transcriptionDir, txtFile);
-            const newPath = path.join(transcriptionDir, `${id}.txt`);
-            await fsPromises.rename(oldPath, newPath);
-            
-            const text = await fsPromises.readFile(newPath, 'utf-8');
-            
-            await generatePDF(id, text, transcription.filename);
-            
-            transcription.status = 'completed';
-            transcription.progress = 100;
-            transcription.text = text;
-            transcription.endTime = Date.now();
-          } else {
-            throw new Error('Transcription file not found');
-          }
-        } catch (error) {
-          transcription.status = 'error';
-          transcription.error = error.message;
-        }
-      } else {
-        transcription.status = 'error';
-        transcription.error = `Whisper process exited with code ${code}: ${stderr}`;
+// Run a job through the Whisper workers and write its TXT; `timer` follows
+// the job through its stages
+async function transcribe(id, file, model, language, timer) {
+  const transcription = transcriptions.get(id);
+
+  // Wait for a worker slot; the workers keep models loaded, so only the
+  // first job for a model pays for Python start-up and the weight load.
+  // Long recordings are cut into chunks that run on several workers.
+  const job = { id, audio: file.path, size: file.size, model, language };
+  const run = isLongAudio(file.size)
+    ? hooks => transcribeLong(scheduler, job, hooks)
+    : hooks => scheduler.submit(job, hooks);
+  // Admission control happened when the upload arrived
+  timer.enter('queued');
+  const result = await run({
+    force: true,
+    onStart: () => {
+      transcriptions.update(id, { status: 'processing', queuePosition: null, estimatedStartTime: null });
+    },
+    onEvent: (event) => {
+      if (event.type === 'segment') {
+        // Forwarded to the page as soon as it is decoded
+        transcriptions.append(id, 'segments', { start: event.start, end: event.end, text: event.text });
+        return;
       }
-      
-      transcriptions.set(id, transcription);
-      
-      setTimeout(async () => {
-        try {
-          await fsPromises.unlink(audioPath);
-        } catch (error) {
-          console.error('Error cleaning up audio file:', error);
-        }
-      }, 5000);
-    });
+      timer.enter(event.stage);
+      transcriptions.update(id, { stage: event.stage });
+      if (event.stage === 'transcribing' && event.duration > 0) {
+        updateProgress(transcription, event.processed, event.duration);
+      }
+    }
+  });
 
-    whisperProcess.on('error', (error) => {
-      transcription.status = 'error';
-      transcription.error = error.message;
-      transcriptions.set(id, transcription);
-    });
+  timer.enter('saving');
+  await transcripts.write(id, 'txt', result.text);
+  return result.text;
+}
 
-  } catch (error) {
-    transcription.status = 'error';
-    transcription.error = error.message;
-    transcriptions.set(id, transcription);
+// Progress from the end timestamp of the last decoded segment against the
+// audio duration. The realtime factor is seconds of audio decoded per
+// second of wall time, and gives the ETA for the rest of the audio.
+function updateProgress(transcription, processed, duration) {
+  const now = Date.now();
+  const transcribeStart = processed === 0 || !transcription.transcribeStart
+    ? now
+    : transcription.transcribeStart;
+
+  const changes = {
+    transcribeStart,
+    audioDuration: duration,
+    audioProcessed: processed,
+    // 100 is kept for when the transcript has been written
+    progress: Math.min(99, Math.floor(processed / duration * 100))
+  };
+
+  const elapsed = (now - transcribeStart) / 1000;
+  if (processed > 0 && elapsed > 0) {
+    const rate = processed / elapsed;
+    changes.realtimeFactor = Number(rate.toFixed(2));
+    changes.etaSeconds = Math.round((duration - processed) / rate);
   }
+  transcriptions.update(transcription.id, changes);
 }
 
-async function generatePDF(id, text, originalFilename) {
-  const pdfPath = path.join(__dirname, '../transcriptions', `${id}.pdf`);
+// Render a job's PDF into `res` while it is produced, keeping a copy at
+// `pdfPath` (and in the result cache) for later downloads. PDFs are only
+// made for jobs someone downloads one for.
+async function exportPDF(transcription, pdfPath, res) {
+  const temporaryPath = `${pdfPath}.${uuidv4()}.tmp`;
+  const started = process.hrtime.bigint();
   const doc = new PDFDocument();
-  const stream = doc.pipe(fs.createWriteStream(pdfPath));
+  const file = doc.pipe(fs.createWriteStream(temporaryPath));
+  doc.pipe(res);
 
   doc.fontSize(20).text('Audio Transcription', { align: 'center' });
   doc.moveDown();
-  doc.fontSize(12).text(`Original File: ${originalFilename}`, { align: 'left' });
+  doc.fontSize(12).text(`Original File: ${transcription.filename}`, { align: 'left' });
   doc.text(`Date: ${new Date().toLocaleString()}`, { align: 'left' });
   doc.moveDown();
-  doc.fontSize(11).text(text, { align: 'justify' });
+  doc.fontSize(11).text(await readTranscript(transcription.id), { align: 'justify' });
 
   doc.end();
-  await new Promise(resolve => stream.on('finish', resolve));
+  try {
+    await new Promise((resolve, reject) => file.on('finish', resolve).on('error', reject));
+    metrics.exportSeconds.observe({ format: 'pdf' }, Number(process.hrtime.bigint() - started) / 1e9);
+    await fsPromises.rename(temporaryPath, pdfPath);
+    await resultCache.store(transcription.cacheKey, { pdf: pdfPath });
+  } catch (error) {
+    console.error('Error saving PDF export:', error);
+    await fsPromises.unlink(temporaryPath).catch(() => {});
+  }
 }
 
+// Jobs that were queued or running when the server stopped are run again
+// if their upload is still there
+async function recoverTranscriptions() {
+  const interrupted = [...transcriptions.withStatus('queued'), ...transcriptions.withStatus('processing')];
+  const batchItems = new Map();
+  for (const transcription of interrupted) {
+    const { id, audio, model, language, batchId } = transcription;
+    try {
+      await fsPromises.access(audio.path);
+    } catch (error) {
+      transcriptions.update(id, { status: 'error', error: 'Interrupted by a server restart', endTime: Date.now() });
+      continue;
+    }
+    transcriptions.update(id, { status: 'queued', progress: 0, segments: [] });
+    const item = { id, file: { ...audio, originalname: transcription.filename }, model, language };
+    if (batchId) {
+      batchItems.set(batchId, [...(batchItems.get(batchId) || []), item]);
+    } else {
+      scheduler.hold([{ id, model, size: audio.size }]);
+      processTranscription(id, item.file, model, language);
+    }
+  }
+  for (const items of batchItems.values()) {
+    runBatch(items);
+  }
+}
+
+recoverTranscriptions();
+
 app.listen(PORT, () => {
   console.log(`Server running on http://localhost:${PORT}`);
 });
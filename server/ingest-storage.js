@@ -0,0 +1,130 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const { spawn, spawnSync } = require('child_process');
+const { pipeline } = require('stream/promises');
+const { PassThrough, Transform } = require('stream');
+const { metrics } = require('./metrics');
+
+// Sample rate and layout whisper consumes: 16-bit little-endian mono
+const SAMPLE_RATE = 16000;
+
+// Containers that keep their index at the end of the file cannot be read
+// from a pipe, so these are stored as uploaded and decoded later; so are
+// the tar archives of batch uploads, which are unpacked instead
+const STORE_AS_UPLOADED = /\.(m4a|mp4|mov|3gp|tar|tgz|tar\.gz)$/i;
+
+let ffmpegAvailable = null;
+
+function hasFfmpeg() {
+  if (ffmpegAvailable === null) {
+    ffmpegAvailable = !spawnSync('ffmpeg', ['-version'], { stdio: 'ignore' }).error;
+  }
+  return ffmpegAvailable;
+}
+
+// Decode `source` to raw PCM at `target` as it arrives
+function decode(source, target) {
+  const ffmpeg = spawn('ffmpeg', [
+    '-nostdin', '-v', 'error', '-i', 'pipe:0',
+    '-f', 's16le', '-ac', '1', '-ar', String(SAMPLE_RATE), 'pipe:1'
+  ], { stdio: ['pipe', 'pipe', 'pipe'] });
+
+  let stderr = '';
+  ffmpeg.stderr.on('data', (data) => {
+    stderr = (stderr + data.toString()).slice(-2048);
+  });
+
+  // If ffmpeg gives up early, drain the rest of the upload so the request
+  // still completes and the error can be reported
+  source.pipe(ffmpeg.stdin);
+  ffmpeg.stdin.on('error', () => {
+    source.unpipe(ffmpeg.stdin);
+    source.resume();
+  });
+  // A failed upload (too large, aborted) leaves nothing worth decoding
+  source.on('error', () => ffmpeg.kill());
+
+  const exited = new Promise((resolve, reject) => {
+    ffmpeg.on('error', reject);
+    ffmpeg.on('close', (code) => {
+      if (code === 0) {
+        resolve();
+      } else {
+        reject(new Error(`Could not decode audio: ${stderr.trim() || `ffmpeg exited with code ${code}`}`));
+      }
+    });
+  });
+
+  return Promise.all([pipeline(ffmpeg.stdout, fs.createWriteStream(target)), exited]);
+}
+
+// Multer storage engine for audio uploads. The upload is hashed (for the
+// result cache) and, when ffmpeg is installed, decoded to 16kHz mono PCM
+// while it streams in; only the `.pcm` file is kept, so the worker never
+// decodes it again. Formats that cannot be decoded from a pipe, or a
+// server without ffmpeg, fall back to storing the file as uploaded.
+// `file.size` is always the uploaded size and `file.hash` its SHA-256.
+class IngestStorage {
+  constructor({ destination, filename, decode = hasFfmpeg() }) {
+    this.destination = destination;
+    this.filename = filename;
+    this.decode = decode;
+  }
+
+  async _handleFile(req, file, cb) {
+    const started = process.hrtime.bigint();
+    let filePath = null;
+    try {
+      const destination = await this.destination(req, file);
+      let filename = this.filename(req, file);
+      const decoding = this.decode && !STORE_AS_UPLOADED.test(file.originalname || filename);
+      if (decoding) {
+        filename = `${path.parse(filename).name}.pcm`;
+      }
+      filePath = path.join(destination, filename);
+
+      const hash = crypto.createHash('sha256');
+      let size = 0;
+      const tap = new Transform({
+        transform(chunk, encoding, callback) {
+          hash.update(chunk);
+          size += chunk.length;
+          callback(null, chunk);
+        }
+      });
+
+      if (decoding) {
+        const upload = new PassThrough();
+        await Promise.all([pipeline(file.stream, tap, upload), decode(upload, filePath)]);
+      } else {
+        await pipeline(file.stream, tap, fs.createWriteStream(filePath));
+      }
+      const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+      metrics.uploadBytes.inc({}, size);
+      if (seconds > 0) {
+        metrics.uploadBytesPerSecond.observe({}, size / seconds);
+      }
+      cb(null, {
+        destination,
+        filename,
+        path: filePath,
+        size,
+        hash: hash.digest('hex'),
+        decoded: decoding,
+        uploadSeconds: seconds
+      });
+    } catch (error) {
+      if (filePath) {
+        fs.unlink(filePath, () => {});
+      }
+      cb(error);
+    }
+  }
+
+  _removeFile(req, file, cb) {
+    fs.unlink(file.path, () => cb(null));
+  }
+}
+
+module.exports = { IngestStorage, hasFfmpeg };
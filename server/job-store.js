@@ -0,0 +1,260 @@
+const { EventEmitter } = require('events');
+const fs = require('fs');
+const path = require('path');
+
+const DEFAULT_DATA_DIR = path.join(__dirname, '../data');
+
+// Fields that change many times a second while a job runs, or that are
+// only useful while it runs; they are kept in memory and never journaled
+const VOLATILE = new Set([
+  'progress',
+  'stage',
+  'audioDuration',
+  'audioProcessed',
+  'realtimeFactor',
+  'etaSeconds',
+  'transcribeStart',
+  'queuePosition',
+  'estimatedStartTime',
+  'segments'
+]);
+
+const FINISHED = ['completed', 'error'];
+
+// The journal is rewritten once it is this many times longer than needed
+const COMPACT_RATIO = 4;
+const COMPACT_MIN_LINES = 1000;
+
+function durable(job) {
+  const record = {};
+  for (const [key, value] of Object.entries(job)) {
+    if (!VOLATILE.has(key)) {
+      record[key] = value;
+    }
+  }
+  return record;
+}
+
+// Transcription jobs, kept durable in an append-only journal of JSON
+// lines (data/jobs.jsonl) that is replayed at start-up, so jobs survive
+// restarts and crashes. Changes made in one tick of the event loop are
+// written together, and the journal is fsynced whenever a job is created,
+// deleted or changes status, so those survive a power loss as well. Only job metadata is held in memory: transcripts
+// live in their files, and finished jobs are evicted after a TTL or once
+// there are too many of them.
+//
+// Every change goes through update(), which emits just the fields that
+// changed as an event named after the job id, so listeners (the SSE
+// endpoint) can push small deltas to clients; list fields grow through
+// append(), which emits only the new item.
+class JobStore extends EventEmitter {
+  constructor(options = {}) {
+    super();
+    // One listener per open event stream
+    this.setMaxListeners(0);
+    this.dir = options.dir || process.env.VIBE_DATA_DIR || DEFAULT_DATA_DIR;
+    this.ttlMs = (options.ttlHours ?? Number(process.env.VIBE_JOB_TTL_HOURS || 24)) * 3600 * 1000;
+    this.maxJobs = options.maxJobs ?? Number(process.env.VIBE_MAX_JOBS || 1000);
+    this.journalPath = path.join(this.dir, `${options.name || 'jobs'}.jsonl`);
+    this.jobs = new Map();
+    this.statusIndex = new Map();
+    this.journalLines = 0;
+    this.fd = null;
+    // Journal lines not written yet, and whether writing them must fsync
+    this.unwritten = [];
+    this.syncNeeded = false;
+    this.flushScheduled = false;
+
+    this.load();
+    this.compact();
+  }
+
+  // Replay the journal; a torn last line from a crash is skipped
+  load() {
+    fs.mkdirSync(this.dir, { recursive: true });
+    if (!fs.existsSync(this.journalPath)) {
+      return;
+    }
+
+    for (const line of fs.readFileSync(this.journalPath, 'utf-8').split('\n')) {
+      if (!line) {
+        continue;
+      }
+      let record;
+      try {
+        record = JSON.parse(line);
+      } catch (error) {
+        continue;
+      }
+      if (record.op === 'put') {
+        this.index(record.job);
+      } else if (record.op === 'update' && this.jobs.has(record.id)) {
+        const job = this.jobs.get(record.id);
+        this.unindex(job);
+        Object.assign(job, record.changes);
+        this.index(job);
+      } else if (record.op === 'delete' && this.jobs.has(record.id)) {
+        this.unindex(this.jobs.get(record.id));
+        this.jobs.delete(record.id);
+      }
+    }
+  }
+
+  // Rewrite the journal as one line per live job
+  compact() {
+    const temporary = `${this.journalPath}.tmp`;
+    const lines = [...this.jobs.values()].map(job => JSON.stringify({ op: 'put', job: durable(job) }));
+    const fd = fs.openSync(temporary, 'w');
+    fs.writeSync(fd, lines.map(line => `${line}\n`).join(''));
+    fs.fsyncSync(fd);
+    fs.closeSync(fd);
+    fs.renameSync(temporary, this.journalPath);
+
+    if (this.fd !== null) {
+      fs.closeSync(this.fd);
+    }
+    this.fd = fs.openSync(this.journalPath, 'a');
+    this.journalLines = lines.length;
+    // The rewritten journal already holds every change
+    this.unwritten = [];
+    this.syncNeeded = false;
+  }
+
+  log(record) {
+    this.unwritten.push(`${JSON.stringify(record)}\n`);
+    if (record.op !== 'update' || 'status' in record.changes) {
+      this.syncNeeded = true;
+    }
+    if (!this.flushScheduled) {
+      this.flushScheduled = true;
+      setImmediate(() => this.flush());
+    }
+    this.journalLines++;
+    if (this.journalLines > COMPACT_MIN_LINES && this.journalLines > COMPACT_RATIO * this.jobs.size) {
+      this.compact();
+    }
+  }
+
+  flush() {
+    this.flushScheduled = false;
+    if (this.unwritten.length > 0) {
+      fs.writeSync(this.fd, this.unwritten.join(''));
+      this.unwritten = [];
+    }
+    if (this.syncNeeded) {
+      fs.fsyncSync(this.fd);
+      this.syncNeeded = false;
+    }
+  }
+
+  index(job) {
+    this.jobs.set(job.id, job);
+    if (!this.statusIndex.has(job.status)) {
+      this.statusIndex.set(job.status, new Set());
+    }
+    this.statusIndex.get(job.status).add(job.id);
+  }
+
+  unindex(job) {
+    const ids = this.statusIndex.get(job.status);
+    if (ids) {
+      ids.delete(job.id);
+    }
+  }
+
+  create(job) {
+    this.index(job);
+    this.log({ op: 'put', job: durable(job) });
+    this.evict();
+    return job;
+  }
+
+  get(id) {
+    return this.jobs.get(id);
+  }
+
+  withStatus(status) {
+    return [...(this.statusIndex.get(status) || [])].map(id => this.jobs.get(id));
+  }
+
+  update(id, changes) {
+    const job = this.jobs.get(id);
+    if (!job) {
+      return null;
+    }
+
+    const delta = {};
+    for (const [key, value] of Object.entries(changes)) {
+      if (job[key] !== value) {
+        delta[key] = value;
+      }
+    }
+    if (Object.keys(delta).length === 0) {
+      return job;
+    }
+
+    this.unindex(job);
+    Object.assign(job, delta);
+    this.index(job);
+
+    const persistent = durable(delta);
+    if (Object.keys(persistent).length > 0) {
+      this.log({ op: 'update', id, changes: persistent });
+    }
+    this.emit(id, delta, 'update');
+    return job;
+  }
+
+  append(id, key, item) {
+    const job = this.jobs.get(id);
+    if (!job) {
+      return null;
+    }
+
+    (job[key] = job[key] || []).push(item);
+    this.emit(id, { [key]: [item] }, 'append');
+    return job;
+  }
+
+  delete(id) {
+    const job = this.jobs.get(id);
+    if (job) {
+      this.unindex(job);
+      this.jobs.delete(id);
+      this.log({ op: 'delete', id });
+      this.emit('evict', job);
+    }
+  }
+
+  // Drop finished jobs older than the TTL, then the oldest finished jobs
+  // while there are more than maxJobs; emits 'evict' for each
+  evict() {
+    const finished = FINISHED.flatMap(status => this.withStatus(status))
+      .sort((a, b) => (a.endTime || 0) - (b.endTime || 0));
+    const expired = Date.now() - this.ttlMs;
+    let excess = this.jobs.size - this.maxJobs;
+
+    for (const job of finished) {
+      if ((job.endTime || 0) >= expired && excess <= 0) {
+        break;
+      }
+      this.delete(job.id);
+      excess--;
+    }
+  }
+
+  // Number of jobs in each status
+  counts() {
+    const counts = {};
+    for (const [status, ids] of this.statusIndex) {
+      counts[status] = ids.size;
+    }
+    return counts;
+  }
+
+  stats() {
+    return { jobs: this.jobs.size, maxJobs: this.maxJobs, journalLines: this.journalLines, ...this.counts() };
+  }
+}
+
+module.exports = { JobStore, FINISHED };
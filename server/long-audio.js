@@ -0,0 +1,121 @@
+const fsPromises = require('fs').promises;
+const path = require('path');
+
+// Uploads at least this large are split and transcribed in parallel
+const LONG_AUDIO_BYTES = Number(process.env.VIBE_LONG_AUDIO_MB || 20) * 2 ** 20;
+
+// Chunks per worker, so a slow chunk does not leave the other workers idle
+const CHUNKS_PER_WORKER = 2;
+
+// Lines on both sides of a seam closer than this (seconds) may be duplicates
+const SEAM_SECONDS = 2;
+
+function isLongAudio(size) {
+  return size >= LONG_AUDIO_BYTES;
+}
+
+function normalize(text) {
+  return text.toLowerCase().replace(/[^\p{L}\p{N}]+/gu, ' ').trim();
+}
+
+// Put per-chunk segments back on the recording's timeline, in order. Each
+// chunk keeps only the segments centred in the span it is responsible for,
+// which drops what it decoded from the overlap with its neighbours; a line
+// that still shows up on both sides of a seam is kept once.
+function stitch(chunks, results) {
+  const segments = [];
+  chunks.forEach((chunk, index) => {
+    let atSeam = index > 0;
+    for (const segment of results[index].segments) {
+      const start = segment.start + chunk.offset;
+      const end = segment.end + chunk.offset;
+      const middle = (start + end) / 2;
+      if (middle < chunk.start || middle >= chunk.end) {
+        continue;
+      }
+
+      const previous = segments[segments.length - 1];
+      const repeated = atSeam && previous
+        && start - previous.end < SEAM_SECONDS
+        && normalize(previous.text) === normalize(segment.text);
+      atSeam = false;
+      if (!repeated) {
+        segments.push({ start, end, text: segment.text });
+      }
+    }
+  });
+  return segments;
+}
+
+// Transcribe a long recording as chunks cut at quiet points, spread over
+// all workers. Resolves like a single worker result ({ text, segments,
+// language }); progress is reported against the whole recording.
+async function transcribeLong(scheduler, job, { onStart = () => {}, onEvent = () => {} } = {}) {
+  // The upload was admitted already, so its parts skip the queue limit
+  const split = await scheduler.submit({
+    id: `${job.id}:split`,
+    parent: job.id,
+    type: 'split',
+    audio: job.audio,
+    chunks: scheduler.concurrency * CHUNKS_PER_WORKER
+  }, {
+    onStart: () => {
+      onStart();
+      onEvent({ stage: 'splitting' });
+    },
+    force: true
+  });
+
+  const { duration, chunks } = split;
+  const processed = chunks.map(() => 0);
+
+  try {
+    const settled = await Promise.allSettled(chunks.map((chunk, index) => scheduler.submit({
+      ...job,
+      id: `${job.id}:${index}`,
+      parent: job.id,
+      audio: chunk.audio,
+      size: Math.round(job.size * (chunk.end - chunk.start) / duration)
+    }, {
+      force: true,
+      onEvent: (event) => {
+        if (event.type === 'segment') {
+          // Forward segments on the recording's timeline as they arrive;
+          // the ones decoded from a neighbour's span come from that chunk
+          const start = event.start + chunk.offset;
+          const end = event.end + chunk.offset;
+          const middle = (start + end) / 2;
+          if (middle >= chunk.start && middle < chunk.end) {
+            onEvent({ type: 'segment', start, end, text: event.text });
+          }
+          return;
+        }
+        if (event.stage !== 'transcribing' || event.processed === undefined) {
+          return;
+        }
+        processed[index] = event.processed;
+        const total = processed.reduce((sum, seconds) => sum + seconds, 0);
+        onEvent({ stage: 'transcribing', processed: Math.min(total, duration), duration });
+      }
+    })));
+
+    const failed = settled.find(outcome => outcome.status === 'rejected');
+    if (failed) {
+      throw failed.reason;
+    }
+
+    const results = settled.map(outcome => outcome.value);
+    const segments = stitch(chunks, results);
+    return {
+      text: segments.map(segment => `${segment.text}\n`).join(''),
+      segments,
+      language: results[0].language
+    };
+  } finally {
+    if (chunks[0].audio !== job.audio) {
+      await fsPromises.rm(path.dirname(chunks[0].audio), { recursive: true, force: true });
+    }
+  }
+}
+
+module.exports = { isLongAudio, stitch, transcribeLong };
@@ -0,0 +1,180 @@
+// Minimal Prometheus metrics: counters, gauges and histograms with
+// labels, rendered in the text exposition format for GET /metrics.
+
+const DEFAULT_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600];
+
+function labelKey(labels) {
+  return JSON.stringify(Object.entries(labels).sort(([a], [b]) => a.localeCompare(b)));
+}
+
+function formatLabels(labels) {
+  const pairs = Object.entries(labels)
+    .map(([name, value]) => `${name}="${String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')}"`);
+  return pairs.length ? `{${pairs.join(',')}}` : '';
+}
+
+class Metric {
+  // `collect` returns the current value(s) at scrape time instead of
+  // values recorded as they happen: a number, or [[labels, value], ...]
+  constructor(type, name, help, collect = null) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    this.collect = collect;
+    this.values = new Map();
+  }
+
+  samples() {
+    if (this.collect) {
+      const value = this.collect();
+      return Array.isArray(value) ? value : [[{}, value]];
+    }
+    return [...this.values.values()].map(({ labels, value }) => [labels, value]);
+  }
+
+  render() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+    for (const [labels, value] of this.samples()) {
+      lines.push(`${this.name}${formatLabels(labels)} ${value}`);
+    }
+    return lines.join('\n');
+  }
+}
+
+class Counter extends Metric {
+  constructor(name, help, collect) {
+    super('counter', name, help, collect);
+  }
+
+  inc(labels = {}, amount = 1) {
+    const key = labelKey(labels);
+    const entry = this.values.get(key) || { labels, value: 0 };
+    entry.value += amount;
+    this.values.set(key, entry);
+  }
+}
+
+class Gauge extends Metric {
+  constructor(name, help, collect) {
+    super('gauge', name, help, collect);
+  }
+
+  set(labels, value) {
+    this.values.set(labelKey(labels), { labels, value });
+  }
+}
+
+class Histogram extends Metric {
+  constructor(name, help, buckets = DEFAULT_BUCKETS) {
+    super('histogram', name, help);
+    this.buckets = buckets;
+  }
+
+  observe(labels, value) {
+    const key = labelKey(labels);
+    let entry = this.values.get(key);
+    if (!entry) {
+      entry = { labels, counts: this.buckets.map(() => 0), sum: 0, count: 0 };
+      this.values.set(key, entry);
+    }
+    this.buckets.forEach((bound, index) => {
+      if (value <= bound) {
+        entry.counts[index]++;
+      }
+    });
+    entry.sum += value;
+    entry.count++;
+  }
+
+  render() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    for (const { labels, counts, sum, count } of this.values.values()) {
+      this.buckets.forEach((bound, index) => {
+        lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: bound })} ${counts[index]}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${sum}`);
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+    }
+    return lines.join('\n');
+  }
+}
+
+class Registry {
+  constructor() {
+    this.metrics = [];
+  }
+
+  register(metric) {
+    this.metrics.push(metric);
+    return metric;
+  }
+
+  counter(name, help, collect) {
+    return this.register(new Counter(name, help, collect));
+  }
+
+  gauge(name, help, collect) {
+    return this.register(new Gauge(name, help, collect));
+  }
+
+  histogram(name, help, buckets) {
+    return this.register(new Histogram(name, help, buckets));
+  }
+
+  render() {
+    return `${this.metrics.map(metric => metric.render()).join('\n')}\n`;
+  }
+}
+
+// Seconds spent in each stage of a job, e.g. { queued: 1.2, transcribing: 30.5 }
+class StageTimer {
+  constructor(stage) {
+    this.timings = {};
+    this.stage = stage;
+    this.since = process.hrtime.bigint();
+  }
+
+  enter(stage) {
+    if (stage === this.stage) {
+      return;
+    }
+    const now = process.hrtime.bigint();
+    const seconds = Number(now - this.since) / 1e9;
+    this.timings[this.stage] = (this.timings[this.stage] || 0) + seconds;
+    this.stage = stage;
+    this.since = now;
+  }
+
+  finish() {
+    this.enter(null);
+    return this.timings;
+  }
+}
+
+const registry = new Registry();
+
+// Recorded where the work happens; gauges of live state are attached by
+// the server with collect callbacks
+const metrics = {
+  modelLoadSeconds: registry.histogram(
+    'vibe_model_load_seconds', 'Time to load a Whisper model into a worker'),
+  decodeSeconds: registry.histogram(
+    'vibe_decode_seconds', 'Time Whisper spent decoding a job (or chunk)'),
+  realtimeFactor: registry.histogram(
+    'vibe_realtime_factor', 'Seconds of audio decoded per second of wall time',
+    [0.25, 0.5, 1, 2, 4, 8, 16, 32, 64]),
+  uploadBytes: registry.counter(
+    'vibe_upload_bytes_total', 'Bytes of audio received'),
+  uploadBytesPerSecond: registry.histogram(
+    'vibe_upload_bytes_per_second', 'Upload throughput per file',
+    [64e3, 256e3, 1e6, 4e6, 16e6, 64e6, 256e6]),
+  exportSeconds: registry.histogram(
+    'vibe_export_render_seconds', 'Time to render an export on first download'),
+  jobs: registry.counter(
+    'vibe_jobs_total', 'Finished transcription jobs'),
+  stageSeconds: registry.histogram(
+    'vibe_job_stage_seconds', 'Time jobs spent in each stage')
+};
+
+module.exports = { Registry, StageTimer, registry, metrics };
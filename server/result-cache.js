@@ -0,0 +1,168 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const fsPromises = require('fs').promises;
+const path = require('path');
+
+const DEFAULT_CACHE_DIR = path.join(__dirname, '../cache/results');
+const DEFAULT_LIMIT_MB = 256;
+
+// Files kept for a cached transcription: the transcript always, exports
+// once someone has downloaded them
+const FORMATS = ['txt', 'pdf'];
+const ENTRY_FILE = /^([0-9a-f]{64})\.(txt|pdf)$/;
+
+// Persistent cache of finished transcriptions keyed by (audio hash, model,
+// language). Entries are plain files named after the key, evicted least
+// recently used first once their total size passes the limit; the last use
+// is the file mtime, as with the icon cache.
+class ResultCache {
+  constructor(options = {}) {
+    this.dir = options.dir || process.env.VIBE_RESULT_CACHE || DEFAULT_CACHE_DIR;
+    this.limitBytes = (options.limitMb
+      ?? Number(process.env.VIBE_RESULT_CACHE_MB || DEFAULT_LIMIT_MB)) * 2 ** 20;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+    this.scan();
+  }
+
+  static key(hash, model, language) {
+    return crypto.createHash('sha256').update(`${hash}\0${model}\0${language}`).digest('hex');
+  }
+
+  // Rebuild the index from disk so the cache survives restarts
+  scan() {
+    fs.mkdirSync(this.dir, { recursive: true });
+    for (const name of fs.readdirSync(this.dir)) {
+      const match = ENTRY_FILE.exec(name);
+      if (!match) {
+        // Leftover temporary copy from an interrupted store
+        fs.rmSync(path.join(this.dir, name), { force: true });
+        continue;
+      }
+      const [, key, format] = match;
+      const stat = fs.statSync(path.join(this.dir, name));
+      const entry = this.entries.get(key) || { bytes: 0, lastUsed: 0, formats: new Set() };
+      entry.bytes += stat.size;
+      entry.lastUsed = Math.max(entry.lastUsed, stat.mtimeMs);
+      entry.formats.add(format);
+      this.entries.set(key, entry);
+    }
+    // Drop exports whose transcript is gone
+    for (const [key, entry] of this.entries) {
+      if (!entry.formats.has('txt')) {
+        this.remove(key);
+      }
+    }
+  }
+
+  filePath(key, format) {
+    return path.join(this.dir, `${key}.${format}`);
+  }
+
+  get bytes() {
+    let total = 0;
+    for (const entry of this.entries.values()) {
+      total += entry.bytes;
+    }
+    return total;
+  }
+
+  // Return a cached transcript, copying whichever exports are cached with
+  // it to `outputs` ({ pdf } paths), or null on a miss
+  async restore(key, outputs) {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return null;
+    }
+
+    let text;
+    try {
+      text = await fsPromises.readFile(this.filePath(key, 'txt'), 'utf-8');
+      for (const format of entry.formats) {
+        if (outputs[format]) {
+          await fsPromises.copyFile(this.filePath(key, format), outputs[format]);
+        }
+      }
+    } catch (error) {
+      // Removed behind our back; treat as a miss
+      this.remove(key);
+      this.misses++;
+      return null;
+    }
+
+    this.hits++;
+    const now = new Date();
+    entry.lastUsed = now.getTime();
+    for (const format of entry.formats) {
+      fsPromises.utimes(this.filePath(key, format), now, now).catch(() => {});
+    }
+    return text;
+  }
+
+  // Keep a transcription: { txt: text } when it finishes, or { pdf: path }
+  // (a file to copy) once that export has been rendered
+  async store(key, files) {
+    const entry = this.entries.get(key) || { bytes: 0, lastUsed: 0, formats: new Set() };
+    if (files.txt === undefined && !entry.formats.has('txt')) {
+      // The transcript was evicted in the meantime
+      return;
+    }
+
+    for (const format of FORMATS.filter(name => files[name] !== undefined)) {
+      const target = this.filePath(key, format);
+      // Write under a temporary name so a crash never leaves a partial file
+      const temporary = `${target}.${process.pid}.${Date.now()}.tmp`;
+      if (format === 'txt') {
+        await fsPromises.writeFile(temporary, files.txt, 'utf-8');
+      } else {
+        await fsPromises.copyFile(files[format], temporary);
+      }
+      await fsPromises.rename(temporary, target);
+      if (!entry.formats.has(format)) {
+        entry.bytes += (await fsPromises.stat(target)).size;
+        entry.formats.add(format);
+      }
+    }
+    entry.lastUsed = Date.now();
+    this.entries.set(key, entry);
+    this.evict();
+  }
+
+  remove(key) {
+    for (const format of FORMATS) {
+      fs.rm(this.filePath(key, format), { force: true }, () => {});
+    }
+    this.entries.delete(key);
+  }
+
+  evict() {
+    let total = this.bytes;
+    const oldestFirst = [...this.entries].sort((a, b) => a[1].lastUsed - b[1].lastUsed);
+    for (const [key, entry] of oldestFirst) {
+      if (total <= this.limitBytes) {
+        break;
+      }
+      total -= entry.bytes;
+      this.remove(key);
+      this.evictions++;
+    }
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      entries: this.entries.size,
+      bytes: this.bytes,
+      limitBytes: this.limitBytes,
+      hits: this.hits,
+      misses: this.misses,
+      hitRate: lookups ? this.hits / lookups : 0,
+      evictions: this.evictions
+    };
+  }
+}
+
+module.exports = { ResultCache };
@@ -0,0 +1,277 @@
+const { EventEmitter } = require('events');
+const os = require('os');
+const { WhisperWorker } = require('./whisper-worker');
+
+// Approximate resident memory of each model in GB (see the README table),
+// shared with whisper_worker.py; `default` is assumed for models not listed
+const MODEL_MEMORY = require('./model-memory.json');
+
+// Starting guesses for processing seconds per MB of upload, refined as
+// jobs finish
+const DEFAULT_SECONDS_PER_MB = {
+  tiny: 2,
+  base: 4,
+  small: 10,
+  medium: 25,
+  large: 50,
+  'large-v2': 50,
+  'large-v3': 50
+};
+
+// A queued job is never passed over for a warm-model job for longer than this
+const MAX_SKIP_MS = 30 * 1000;
+
+class QueueFullError extends Error {
+  constructor(limit) {
+    super(`Server is busy: ${limit} transcriptions are already waiting. Please try again shortly.`);
+    this.name = 'QueueFullError';
+  }
+}
+
+function modelCost(model) {
+  return MODEL_MEMORY.models[model] ?? MODEL_MEMORY.default;
+}
+
+// Memory a worker's resident models take once it has `model` loaded (or
+// as they are, without one): on a miss the worker first unloads least
+// recently used models until the new one fits its budget, as
+// ModelCache.get does
+function workerMemoryGb(worker, model = null) {
+  // A worker that is not running holds nothing
+  const resident = worker.process ? [...worker.cache.resident] : [];
+  const used = () => resident.reduce((total, name) => total + modelCost(name), 0);
+  if (model === null || resident.includes(model)) {
+    return used();
+  }
+  const budget = worker.cache.budget_gb ?? worker.modelMemoryGb ?? Infinity;
+  while (resident.length > 0 && used() + modelCost(model) > budget) {
+    resident.shift();
+  }
+  return used() + modelCost(model);
+}
+
+// Model a worker is loading or using for its current job, if any
+function currentModel(worker) {
+  return worker.current && !worker.current.split ? worker.current.model : null;
+}
+
+// Bounded job queue in front of the Whisper workers. Admits jobs while
+// there is a free worker and every worker's resident models, counting the
+// one the job may load, fit in the memory budget, preferring jobs whose
+// model is already loaded on an idle worker.
+// The memory models may stay resident in between jobs is one host-wide
+// figure, split evenly across the workers.
+// Emits 'dispatch' whenever jobs leave the queue, as positions then move.
+class Scheduler extends EventEmitter {
+  constructor(options = {}) {
+    super();
+    const cores = os.cpus().length || 1;
+    this.concurrency = options.concurrency
+      || Number(process.env.WHISPER_WORKERS)
+      || Math.max(1, Math.floor(cores / 2));
+    this.maxQueue = options.maxQueue || Number(process.env.VIBE_MAX_QUEUE) || 50;
+    this.memoryBudgetGb = options.memoryBudgetGb
+      || Number(process.env.VIBE_MEMORY_BUDGET_GB)
+      || os.totalmem() / 2 ** 30 * 0.75;
+    this.modelMemoryGb = options.modelMemoryGb
+      || Number(process.env.VIBE_MODEL_MEMORY_GB)
+      || os.totalmem() / 2 ** 30 / 2;
+
+    const share = { ...options, modelMemoryGb: this.modelMemoryGb / this.concurrency };
+    this.workers = Array.from({ length: this.concurrency }, () => new WhisperWorker(share));
+    this.queue = [];
+    // Jobs admitted but not yet submitted, such as the later files of a
+    // batch; they count towards the queue limit and wait behind the queue
+    this.held = [];
+    this.running = new Map();
+    this.secondsPerMb = { ...DEFAULT_SECONDS_PER_MB };
+  }
+
+  get queueFull() {
+    return !this.hasRoom(1);
+  }
+
+  // Whether `count` more jobs can be admitted
+  hasRoom(count) {
+    return this.queue.length + this.held.length + count <= this.maxQueue;
+  }
+
+  // Admit jobs ({ id, model, size }) that their owner submits later; they
+  // leave the held list once submitted or released
+  hold(jobs) {
+    this.held.push(...jobs);
+  }
+
+  release(id) {
+    const index = this.held.findIndex(job => job.id === id);
+    if (index !== -1) {
+      this.held.splice(index, 1);
+    }
+  }
+
+  // Queue a job ({ id, audio, model, language, size }); throws QueueFullError
+  // synchronously when the queue is at capacity, unless `force` is set for
+  // the parts of a job that was already admitted
+  submit(job, { onStart = () => {}, onEvent = () => {}, force = false } = {}) {
+    if (this.queueFull && !force) {
+      throw new QueueFullError(this.maxQueue);
+    }
+    this.release(job.parent || job.id);
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ job, onStart, onEvent, resolve, reject, queuedAt: Date.now() });
+      this.dispatch();
+    });
+  }
+
+  // Memory held by models on all workers, including models that busy
+  // workers are still loading and whose load they have not reported yet
+  residentMemoryGb() {
+    return this.workers.reduce((total, worker) => total + workerMemoryGb(worker, currentModel(worker)), 0);
+  }
+
+  // Where `job` would run and the resident memory of all workers once it
+  // has started there: a worker with its model loaded, or else the one
+  // where loading it adds the least
+  place(job, idle) {
+    const resident = this.residentMemoryGb();
+    let best = null;
+    for (const worker of idle) {
+      const memory = job.type === 'split'
+        ? resident
+        : resident - workerMemoryGb(worker) + workerMemoryGb(worker, job.model);
+      if (worker.hasModel(job.model) && job.type !== 'split') {
+        return { worker, memory };
+      }
+      if (!best || memory < best.memory) {
+        best = { worker, memory };
+      }
+    }
+    return best;
+  }
+
+  // Pick the next queued entry and the worker to run it on, or null
+  pick() {
+    const idle = this.workers.filter(worker => !worker.busy);
+    if (idle.length === 0 || this.queue.length === 0) {
+      return null;
+    }
+
+    // A warm-model job goes first, unless the oldest job has waited too
+    // long; when the warm one does not fit, the oldest may still
+    const candidates = [0];
+    if (Date.now() - this.queue[0].queuedAt < MAX_SKIP_MS) {
+      const warm = this.queue.findIndex(entry => idle.some(worker => worker.hasModel(entry.job.model)));
+      if (warm > 0) {
+        candidates.unshift(warm);
+      }
+    }
+
+    for (const index of candidates) {
+      const entry = this.queue[index];
+      const { worker, memory } = this.place(entry.job, idle);
+      // With nothing running the job starts anyway, or it would never run
+      if (this.running.size > 0 && memory > this.memoryBudgetGb) {
+        continue;
+      }
+      this.queue.splice(index, 1);
+      return { entry, worker };
+    }
+    return null;
+  }
+
+  dispatch() {
+    let started = 0;
+    let next;
+    while ((next = this.pick())) {
+      started++;
+      const { entry, worker } = next;
+      const { job, onStart, onEvent, resolve, reject } = entry;
+      const startedAt = Date.now();
+      this.running.set(job.id, { job, startedAt, estimate: this.estimateSeconds(job) });
+      onStart();
+
+      worker.run(job, onEvent)
+        .then((result) => {
+          this.recordDuration(job, (Date.now() - startedAt) / 1000);
+          resolve(result);
+        }, reject)
+        .finally(() => {
+          this.running.delete(job.id);
+          this.dispatch();
+        });
+    }
+    if (started > 0) {
+      this.emit('dispatch');
+    }
+  }
+
+  estimateSeconds(job) {
+    if (job.type === 'split') {
+      return 1;
+    }
+    const rate = this.secondsPerMb[job.model] ?? DEFAULT_SECONDS_PER_MB.large;
+    return Math.max(1, rate * (job.size || 0) / 2 ** 20);
+  }
+
+  recordDuration(job, seconds) {
+    const megabytes = (job.size || 0) / 2 ** 20;
+    if (job.type === 'split' || megabytes < 0.01) {
+      return;
+    }
+    // Exponentially weighted average, so the estimate tracks this machine
+    const previous = this.secondsPerMb[job.model] ?? DEFAULT_SECONDS_PER_MB.large;
+    this.secondsPerMb[job.model] = previous * 0.7 + (seconds / megabytes) * 0.3;
+  }
+
+  // Queue position (1-based) and estimated start time for a waiting job,
+  // held jobs counting as behind the queue; a job split into parts is
+  // placed by its first queued part
+  position(id) {
+    const waiting = [...this.queue.map(entry => entry.job), ...this.held];
+    const index = waiting.findIndex(job => (job.parent || job.id) === id);
+    if (index === -1) {
+      return null;
+    }
+
+    // Work ahead of this job: what is left of running jobs plus the
+    // queued jobs in front of it, spread over all workers
+    const now = Date.now();
+    let seconds = 0;
+    for (const { startedAt, estimate } of this.running.values()) {
+      seconds += Math.max(0, estimate - (now - startedAt) / 1000);
+    }
+    for (const job of waiting.slice(0, index)) {
+      seconds += this.estimateSeconds(job);
+    }
+
+    return {
+      queuePosition: index + 1,
+      estimatedStartTime: now + Math.round(seconds / this.concurrency * 1000)
+    };
+  }
+
+  stats() {
+    return {
+      queued: this.queue.length,
+      held: this.held.length,
+      running: this.running.size,
+      maxQueue: this.maxQueue,
+      concurrency: this.concurrency,
+      memoryBudgetGb: this.memoryBudgetGb,
+      modelMemoryGb: this.modelMemoryGb,
+      residentMemoryGb: this.residentMemoryGb(),
+      workers: this.workers.map(worker => ({
+        pid: worker.process ? worker.process.pid : null,
+        busy: worker.busy,
+        ...worker.cache
+      }))
+    };
+  }
+
+  stop() {
+    this.workers.forEach(worker => worker.stop());
+  }
+}
+
+module.exports = { Scheduler, QueueFullError, modelCost };
@@ -0,0 +1,231 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const fsPromises = require('fs').promises;
+const path = require('path');
+const zlib = require('zlib');
+const { pipeline } = require('stream');
+
+// Just enough of the tar format for batch uploads and bulk downloads:
+// regular files, GNU long names and pax path records, optionally gzipped.
+
+const BLOCK = 512;
+
+function isTarArchive(name) {
+  return /\.(tar|tgz|tar\.gz)$/i.test(name);
+}
+
+function readString(header, start, length) {
+  const field = header.subarray(start, start + length);
+  const end = field.indexOf(0);
+  return field.subarray(0, end === -1 ? field.length : end).toString('utf-8');
+}
+
+function paxPath(data) {
+  // Records look like "<length> <key>=<value>\n"
+  for (const record of data.toString('utf-8').split('\n')) {
+    const match = /^\d+ path=(.*)$/.exec(record);
+    if (match) {
+      return match[1];
+    }
+  }
+  return null;
+}
+
+// Unpack the regular files of a tar archive whose names pass `accept`
+// into `destination`, hashing them on the way. Entries are streamed, so
+// the archive is never held in memory; more than `maxBytes` of unpacked
+// files is an error. Resolves to [{ path, originalname, size, hash }],
+// with files named by `filename(originalname)`.
+async function extractTar(archivePath, destination, { accept, filename, maxBytes = Infinity }) {
+  let source = fs.createReadStream(archivePath);
+  if (/\.(tgz|gz)$/i.test(archivePath)) {
+    source = pipeline(source, zlib.createGunzip(), () => {});
+  }
+
+  const files = [];
+  let buffer = Buffer.alloc(0);
+  // Entry whose data is being read: { remaining, padding, handle, hash, ... }
+  let entry = null;
+  let nextName = null;
+  let extracted = 0;
+
+  const finishEntry = async () => {
+    if (entry.handle) {
+      await entry.handle.close();
+      files.push({ path: entry.path, originalname: entry.name, size: entry.size, hash: entry.hash.digest('hex') });
+    }
+    if (entry.collect) {
+      nextName = entry.collect(Buffer.concat(entry.chunks));
+    }
+    entry = null;
+  };
+
+  for await (const chunk of source) {
+    buffer = buffer.length ? Buffer.concat([buffer, chunk]) : chunk;
+
+    while (true) {
+      if (entry) {
+        const take = Math.min(entry.remaining, buffer.length);
+        const data = buffer.subarray(0, take);
+        if (entry.handle) {
+          entry.hash.update(data);
+          await entry.handle.write(data);
+        } else if (entry.collect) {
+          entry.chunks.push(Buffer.from(data));
+        }
+        entry.remaining -= take;
+        buffer = buffer.subarray(take);
+        if (entry.remaining > 0) {
+          break;
+        }
+        // Data is padded to whole blocks
+        if (buffer.length < entry.padding) {
+          break;
+        }
+        buffer = buffer.subarray(entry.padding);
+        await finishEntry();
+        continue;
+      }
+
+      if (buffer.length < BLOCK) {
+        break;
+      }
+      const header = buffer.subarray(0, BLOCK);
+      buffer = buffer.subarray(BLOCK);
+      if (header.every(byte => byte === 0)) {
+        continue;
+      }
+
+      const size = parseInt(readString(header, 124, 12).trim() || '0', 8);
+      const type = String.fromCharCode(header[156] || 48);
+      const prefix = readString(header, 345, 155);
+      let name = nextName || (prefix ? `${prefix}/${readString(header, 0, 100)}` : readString(header, 0, 100));
+      nextName = null;
+      entry = { remaining: size, padding: (BLOCK - (size % BLOCK)) % BLOCK, size, name };
+
+      if (type === 'L') {
+        entry.chunks = [];
+        entry.collect = data => readString(data, 0, data.length);
+      } else if (type === 'x') {
+        entry.chunks = [];
+        entry.collect = paxPath;
+      } else if (type === '0' && accept(name)) {
+        extracted += size;
+        if (extracted > maxBytes) {
+          await Promise.all(files.map(file => fsPromises.unlink(file.path).catch(() => {})));
+          throw new Error(`Archive holds more than ${Math.round(maxBytes / 2 ** 20)}MB of audio`);
+        }
+        name = path.basename(name);
+        entry.name = name;
+        entry.path = path.join(destination, filename(name));
+        entry.hash = crypto.createHash('sha256');
+        entry.handle = await fsPromises.open(entry.path, 'w');
+      }
+
+      if (size === 0) {
+        await finishEntry();
+      }
+    }
+  }
+
+  if (entry) {
+    if (entry.handle) {
+      await entry.handle.close();
+      await fsPromises.unlink(entry.path).catch(() => {});
+    }
+    throw new Error('Archive is truncated');
+  }
+  return files;
+}
+
+// Header block for one regular file; long names go in a pax record
+function tarHeaders(name, size) {
+  const blocks = [];
+  if (Buffer.byteLength(name) > 100) {
+    // The record length counts its own digits
+    const record = ` path=${name}\n`;
+    let length = Buffer.byteLength(record);
+    while (String(length).length + Buffer.byteLength(record) !== length) {
+      length = String(length).length + Buffer.byteLength(record);
+    }
+    const data = Buffer.from(`${length}${record}`);
+    blocks.push(tarHeader('PaxHeader', data.length, 'x'), data, Buffer.alloc((BLOCK - (data.length % BLOCK)) % BLOCK));
+    name = name.slice(0, 100);
+  }
+  blocks.push(tarHeader(name, size, '0'));
+  return Buffer.concat(blocks);
+}
+
+function tarHeader(name, size, type) {
+  const header = Buffer.alloc(BLOCK);
+  header.write(name, 0, 100, 'utf-8');
+  header.write('0000644\0', 100);
+  header.write('0000000\0', 108);
+  header.write('0000000\0', 116);
+  header.write(`${size.toString(8).padStart(11, '0')}\0`, 124);
+  header.write(`${Math.floor(Date.now() / 1000).toString(8).padStart(11, '0')}\0`, 136);
+  header.write(type, 156);
+  header.write('ustar\0' + '00', 257);
+  // The checksum is computed with its own field set to spaces
+  header.fill(' ', 148, 156);
+  let checksum = 0;
+  for (const byte of header) {
+    checksum += byte;
+  }
+  header.write(`${checksum.toString(8).padStart(6, '0')}\0 `, 148);
+  return header;
+}
+
+// Write a gzipped tar of `entries` ({ name, load }, where `load()` gives
+// the content, so only one entry is in memory at a time) to `output`
+async function writeTarGz(output, entries) {
+  const gzip = zlib.createGzip();
+  let failure = null;
+  const done = new Promise((resolve, reject) => {
+    pipeline(gzip, output, (error) => {
+      failure = error || null;
+      return error ? reject(error) : resolve();
+    });
+  });
+  // Rejections are reported by the writes below, or when `done` is returned
+  done.catch(() => {});
+
+  // Wait for gzip to take more, or fail once the pipeline is torn down
+  // (the client went away), as 'drain' then never comes
+  const closed = () => failure || new Error('Archive stream closed');
+  const write = (data) => {
+    if (gzip.destroyed) {
+      return Promise.reject(closed());
+    }
+    if (gzip.write(data)) {
+      return null;
+    }
+    return new Promise((resolve, reject) => {
+      const onDrain = () => {
+        gzip.off('close', onClose);
+        resolve();
+      };
+      const onClose = () => {
+        gzip.off('drain', onDrain);
+        // Report the pipeline's own error, which is set just after this
+        done.then(() => reject(closed()), reject);
+      };
+      gzip.once('drain', onDrain);
+      gzip.once('close', onClose);
+    });
+  };
+
+  for (const { name, load } of entries) {
+    if (failure || gzip.destroyed) {
+      return done;
+    }
+    const content = Buffer.from(await load());
+    await write(tarHeaders(name, content.length));
+    await write(content);
+    await write(Buffer.alloc((BLOCK - (content.length % BLOCK)) % BLOCK));
+  }
+  gzip.end(Buffer.alloc(BLOCK * 2));
+  return done;
+}
+
+module.exports = { isTarArchive, extractTar, writeTarGz };
@@ -0,0 +1,100 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const fsPromises = require('fs').promises;
+const path = require('path');
+const zlib = require('zlib');
+const { pipeline } = require('stream');
+const { promisify } = require('util');
+
+const gzip = promisify(zlib.gzip);
+const gunzip = promisify(zlib.gunzip);
+
+const DEFAULT_ROOT = path.join(__dirname, '../transcriptions');
+
+// Transcripts at least this large are stored gzip-compressed
+const COMPRESS_BYTES = 16 * 1024;
+
+// Job outputs at fixed paths: transcriptions/ab/cd/<id>.<format>, where
+// ab/cd are the first bytes of a hash of the id. Every lookup is two
+// stats however many transcripts are stored, and no directory grows
+// past a few hundred entries. Large transcripts get a `.gz` suffix and are
+// decompressed as they are read.
+class TranscriptStore {
+  constructor(options = {}) {
+    this.root = options.root || process.env.VIBE_TRANSCRIPTS_DIR || DEFAULT_ROOT;
+  }
+
+  pathFor(id, format) {
+    const digest = crypto.createHash('sha256').update(id).digest('hex');
+    return path.join(this.root, digest.slice(0, 2), digest.slice(2, 4), `${id}.${format}`);
+  }
+
+  // Write `content` for a job, compressing it when it is large; the file
+  // appears under its final name only once complete
+  async write(id, format, content) {
+    const target = this.pathFor(id, format);
+    await fsPromises.mkdir(path.dirname(target), { recursive: true });
+
+    let data = Buffer.from(content);
+    let file = target;
+    if (data.length >= COMPRESS_BYTES) {
+      data = await gzip(data);
+      file = `${target}.gz`;
+    }
+
+    const temporary = `${file}.${process.pid}.${Date.now()}.tmp`;
+    await fsPromises.writeFile(temporary, data);
+    await fsPromises.rename(temporary, file);
+    // A rewrite on the other side of the size threshold leaves the old
+    // form behind; it must not be served instead
+    await fsPromises.rm(file === target ? `${target}.gz` : target, { force: true });
+    return file;
+  }
+
+  // { file, compressed } for a stored output, or null. Should both forms
+  // exist (a rewrite is removing the old one), the newer one wins.
+  async locate(id, format) {
+    const target = this.pathFor(id, format);
+    let found = null;
+    for (const [file, compressed] of [[target, false], [`${target}.gz`, true]]) {
+      try {
+        const { mtimeMs } = await fsPromises.stat(file);
+        if (!found || mtimeMs > found.mtimeMs) {
+          found = { file, compressed, mtimeMs };
+        }
+      } catch (error) {
+        // Try the other form
+      }
+    }
+    return found && { file: found.file, compressed: found.compressed };
+  }
+
+  async read(id, format) {
+    const found = await this.locate(id, format);
+    if (!found) {
+      return null;
+    }
+    const data = await fsPromises.readFile(found.file);
+    return (found.compressed ? await gunzip(data) : data).toString('utf-8');
+  }
+
+  // Stream of the decompressed bytes, or null when there is no such output
+  async createReadStream(id, format) {
+    const found = await this.locate(id, format);
+    if (!found) {
+      return null;
+    }
+    const stream = fs.createReadStream(found.file);
+    // pipeline() passes errors and early closes on to both streams
+    return found.compressed ? pipeline(stream, zlib.createGunzip(), () => {}) : stream;
+  }
+
+  async remove(id, formats) {
+    await Promise.all(formats.flatMap((format) => {
+      const target = this.pathFor(id, format);
+      return [target, `${target}.gz`].map(file => fsPromises.rm(file, { force: true }));
+    }));
+  }
+}
+
+module.exports = { TranscriptStore };
@@ -0,0 +1,191 @@
+const { spawn } = require('child_process');
+const { EventEmitter } = require('events');
+const path = require('path');
+const readline = require('readline');
+const { metrics } = require('./metrics');
+
+const WORKER_SCRIPT = path.join(__dirname, 'whisper_worker.py');
+const STDERR_TAIL_BYTES = 4096;
+
+// Echo everything the worker prints; off by default as whisper and tqdm
+// are chatty and logging every chunk costs the event loop
+const VERBOSE_LOGS = process.env.VIBE_VERBOSE_LOGS === '1';
+
+// Attach the transcript to a result in the layout of whisper's txt
+// writer: one segment per line. The segments whisper returned are
+// authoritative; those streamed during the job are only a fallback.
+function withTranscript(message, streamed) {
+  const segments = message.segments || streamed;
+  return {
+    ...message,
+    segments,
+    text: segments.map(segment => `${segment.text}\n`).join('')
+  };
+}
+
+function emptyCache() {
+  return { resident: [], hits: 0, misses: 0, evictions: 0 };
+}
+
+// One long-lived Python process that keeps Whisper models loaded between
+// jobs. Talks JSON lines over stdin/stdout; see whisper_worker.py.
+class WhisperWorker extends EventEmitter {
+  constructor(options = {}) {
+    super();
+    this.python = options.python || process.env.WHISPER_PYTHON || 'python3';
+    this.stub = options.stub ?? process.env.VIBE_WHISPER_STUB === '1';
+    // GB this process may keep models resident in; its share of the host's
+    this.modelMemoryGb = options.modelMemoryGb || null;
+    this.process = null;
+    this.current = null;
+    this.stderrTail = '';
+    // Latest model cache counters reported by the Python process
+    this.cache = emptyCache();
+  }
+
+  get busy() {
+    return this.current !== null;
+  }
+
+  hasModel(model) {
+    return this.process !== null && this.cache.resident.includes(model);
+  }
+
+  start() {
+    const args = [WORKER_SCRIPT];
+    if (this.stub) {
+      args.push('--stub');
+    }
+    if (this.modelMemoryGb) {
+      args.push('--memory-budget', String(this.modelMemoryGb));
+    }
+
+    const child = spawn(this.python, args, { stdio: ['pipe', 'pipe', 'pipe'] });
+    this.process = child;
+    this.stderrTail = '';
+    // Nothing is loaded in a fresh process until its ready message says so
+    this.cache = emptyCache();
+
+    readline.createInterface({ input: child.stdout }).on('line', (line) => this.handleLine(line));
+
+    child.stderr.on('data', (data) => {
+      if (VERBOSE_LOGS) {
+        console.log('Whisper stderr:', data.toString());
+      }
+      // Keep only a bounded tail for error reports
+      this.stderrTail = (this.stderrTail + data.toString()).slice(-STDERR_TAIL_BYTES);
+    });
+
+    // A write to a process that just died fails with EPIPE; the exit
+    // handler below fails the job
+    child.stdin.on('error', () => {});
+    child.on('error', (error) => this.handleExit(error));
+    child.on('exit', (code, signal) => {
+      this.handleExit(new Error(`Whisper worker exited with ${signal || `code ${code}`}: ${this.stderrTail}`));
+    });
+  }
+
+  handleExit(error) {
+    if (this.process) {
+      this.process = null;
+      this.emit('exit', error);
+    }
+    if (this.current) {
+      const { reject } = this.current;
+      this.current = null;
+      reject(error);
+    }
+  }
+
+  handleLine(line) {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch (error) {
+      if (VERBOSE_LOGS) {
+        console.log('Whisper stdout:', line);
+      }
+      return;
+    }
+
+    const missesBefore = this.cache.misses;
+    if (message.cache) {
+      this.cache = message.cache;
+    }
+    if (message.type === 'ready') {
+      this.emit('ready', message);
+      return;
+    }
+    if (!this.current || message.id !== this.current.id) {
+      return;
+    }
+
+    const { resolve, reject, onEvent, segments, split } = this.current;
+    if (message.type === 'result') {
+      const job = this.current;
+      this.current = null;
+      if (!split) {
+        this.record(job, message, missesBefore);
+      }
+      resolve(split ? message : withTranscript(message, segments));
+    } else if (message.type === 'segment') {
+      const segment = { start: message.start, end: message.end, text: message.text };
+      segments.push(segment);
+      onEvent({ type: 'segment', ...segment });
+    } else if (message.type === 'error') {
+      this.current = null;
+      reject(new Error(message.error));
+    } else {
+      if (message.stage === 'transcribing' && this.current.decodeStart === undefined) {
+        this.current.decodeStart = process.hrtime.bigint();
+        this.current.duration = message.duration;
+      }
+      onEvent(message);
+    }
+  }
+
+  // Model load time (when the job loaded one), decode time and speed
+  record(job, message, missesBefore) {
+    const labels = { model: job.model };
+    if (message.cache && message.cache.misses > missesBefore) {
+      metrics.modelLoadSeconds.observe(labels, message.cache.load_seconds);
+    }
+    if (job.decodeStart !== undefined) {
+      const seconds = Number(process.hrtime.bigint() - job.decodeStart) / 1e9;
+      metrics.decodeSeconds.observe(labels, seconds);
+      if (seconds > 0 && job.duration > 0) {
+        metrics.realtimeFactor.observe(labels, job.duration / seconds);
+      }
+    }
+  }
+
+  run(job, onEvent = () => {}) {
+    if (this.busy) {
+      return Promise.reject(new Error('Whisper worker is busy'));
+    }
+    if (!this.process) {
+      this.start();
+    }
+
+    return new Promise((resolve, reject) => {
+      this.current = {
+        id: job.id,
+        model: job.model,
+        resolve,
+        reject,
+        onEvent,
+        segments: [],
+        split: job.type === 'split'
+      };
+      this.process.stdin.write(`${JSON.stringify({ type: 'transcribe', ...job })}\n`);
+    });
+  }
+
+  stop() {
+    if (this.process) {
+      this.process.kill();
+    }
+  }
+}
+
+module.exports = { WhisperWorker };
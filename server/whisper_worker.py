@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Long-lived Whisper transcription worker
+
+Keeps models loaded between jobs so only the first job for a model pays
+for interpreter start-up, the torch import and the weight load. Jobs are
+read as JSON lines on stdin and answered as JSON lines on stdout:
+
+  -> {"id": "...", "type": "transcribe", "audio": "/path", "model": "base", "language": "auto"}
+  <- {"id": "...", "type": "progress", "stage": "loading_model"}
+  <- {"id": "...", "type": "progress", "stage": "transcribing", "processed": 0, "duration": 61.2}
+  <- {"id": "...", "type": "segment", "start": 0.0, "end": 4.2, "text": "..."}
+  <- {"id": "...", "type": "progress", "stage": "transcribing", "processed": 4.2, "duration": 61.2}
+  <- {"id": "...", "type": "result", "language": "en", "segments": [...], "cache": {...}}
+  <- {"id": "...", "type": "error", "error": "..."}
+
+Long recordings are first cut into chunks at quiet points, which the
+server then transcribes in parallel on several workers:
+
+  -> {"id": "...", "type": "split", "audio": "/path", "chunks": 8}
+  <- {"id": "...", "type": "result", "duration": 7200.0, "chunks": [
+        {"audio": "/path.chunks/000.wav", "offset": 0.0, "start": 0.0, "end": 903.2}, ...]}
+
+Several models stay resident under a memory budget (--memory-budget, in
+GB; the server gives each worker its share of VIBE_MODEL_MEMORY_GB) and
+are evicted least recently used first, weighted by their size. Every result reports the cache counters.
+
+Each segment is sent as soon as it is decoded, parsed from whisper's
+verbose output, for live display. Those lines can be cut short or split
+by newlines in the text, so the result carries the segments whisper
+returned, and the transcript is built from those.
+Progress is the end timestamp of the last decoded segment against the
+duration of the audio, which is probed once before decoding starts.
+
+Audio is any file ffmpeg can read, or a `.pcm` file of raw 16-bit mono
+samples at 16kHz as written by the server's ingest stage, which is passed
+to whisper as an array so it is not decoded a second time.
+
+Run with --stub (or VIBE_WHISPER_STUB=1) to use a deterministic fake
+model that needs neither whisper nor torch, for offline testing.
+"""
+import argparse
+import gc
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import wave
+from collections import OrderedDict
+
+import numpy as np
+
+# Seconds of audio per stub segment
+STUB_SEGMENT_SECONDS = 5.0
+
+# Segment lines printed by whisper's verbose mode: "[01:02.500 --> 01:07.000]  text"
+TIMESTAMP = r"(?:(\d+):)?(\d+):(\d+(?:\.\d+)?)"
+SEGMENT_LINE = re.compile(rf"^\[{TIMESTAMP} --> {TIMESTAMP}\]\s?(.*)$")
+
+# Longest partial line kept while waiting for a newline
+MAX_LINE_BYTES = 4096
+
+# Minimum seconds between two progress messages for the same job
+PROGRESS_INTERVAL = 0.25
+
+# Sample rate whisper decodes at
+SAMPLE_RATE = 16000
+
+# Shortest chunk a long recording is cut into, in seconds
+MIN_CHUNK_SECONDS = 120.0
+
+# How far from the ideal cut a quieter point is looked for, in seconds
+CUT_SEARCH_SECONDS = 15.0
+
+# Audio shared by neighbouring chunks on each side of a cut, in seconds
+CHUNK_OVERLAP_SECONDS = 1.0
+
+# Energy analysis frame and smoothing window, in seconds
+ENERGY_FRAME_SECONDS = 0.03
+ENERGY_WINDOW_SECONDS = 0.3
+
+# Approximate resident memory of each model in GB (see the README table),
+# shared with the scheduler; "default" is assumed for models not listed
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "model-memory.json")) as _table:
+    _MODEL_MEMORY = json.load(_table)
+MODEL_MEMORY_GB = _MODEL_MEMORY["models"]
+DEFAULT_MODEL_MEMORY_GB = _MODEL_MEMORY["default"]
+
+# Private handle on the original stdout, set up by claim_stdout()
+PROTOCOL = None
+
+def claim_stdout():
+    """Reserve stdout for the protocol and send library output to stderr
+
+    whisper, tqdm and native code may print at any time; pointing file
+    descriptor 1 at stderr keeps their output out of the JSON stream.
+    """
+    global PROTOCOL
+    PROTOCOL = os.fdopen(os.dup(1), 'w')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+def emit(message):
+    """Write one protocol message to the real stdout"""
+    PROTOCOL.write(json.dumps(message) + "\n")
+    PROTOCOL.flush()
+
+def default_memory_budget():
+    """Half of physical memory, in GB"""
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 8.0
+    return total / 2**30 / 2
+
+def is_pcm(path):
+    """Whether `path` holds raw 16-bit mono samples at SAMPLE_RATE"""
+    return path.endswith(".pcm")
+
+def audio_duration(path):
+    """Duration of an audio file in seconds, without decoding it"""
+    if is_pcm(path):
+        return os.path.getsize(path) / (2 * SAMPLE_RATE)
+    try:
+        with wave.open(path, 'rb') as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError, OSError):
+        pass
+    try:
+        probe = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", path],
+            capture_output=True, text=True, timeout=30,
+        )
+        return float(probe.stdout.strip())
+    except (OSError, ValueError, subprocess.SubprocessError):
+        # Assume 16-bit mono at 16kHz when ffprobe is missing or fails
+        return os.path.getsize(path) / 32000
+
+def load_audio(path):
+    """Decode `path` to mono float32 samples at SAMPLE_RATE
+
+    Raw `.pcm` files and 16-bit mono WAV files at the right rate are read
+    directly; anything else is decoded with ffmpeg, the same way whisper
+    does it.
+    """
+    if is_pcm(path):
+        return np.fromfile(path, "<i2").astype(np.float32) / 32768.0
+    try:
+        with wave.open(path, 'rb') as wav:
+            if (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, SAMPLE_RATE):
+                pcm = wav.readframes(wav.getnframes())
+                return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+    except (wave.Error, EOFError):
+        pass
+    pcm = subprocess.run(
+        ["ffmpeg", "-nostdin", "-v", "error", "-i", path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        capture_output=True, check=True,
+    ).stdout
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+def write_wav(path, samples):
+    """Write mono float32 samples as a 16-bit WAV file"""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+
+def frame_energy(samples):
+    """Smoothed RMS energy per ENERGY_FRAME_SECONDS frame"""
+    frame = int(SAMPLE_RATE * ENERGY_FRAME_SECONDS)
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, np.float32)
+    frames = samples[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    window = max(1, int(ENERGY_WINDOW_SECONDS / ENERGY_FRAME_SECONDS))
+    return np.convolve(rms, np.ones(window) / window, mode="same")
+
+def find_cuts(samples, chunks):
+    """Times (seconds) to cut `samples` into about `chunks` parts at quiet points
+
+    Each cut is the quietest frame within CUT_SEARCH_SECONDS of where an
+    even split would put it, so words are rarely split across chunks.
+    """
+    duration = len(samples) / SAMPLE_RATE
+    chunk_seconds = max(MIN_CHUNK_SECONDS, duration / max(1, chunks))
+    count = int(duration // chunk_seconds)
+    if count < 2:
+        return []
+
+    energy = frame_energy(samples)
+    cuts = []
+    for index in range(1, count):
+        ideal = duration * index / count
+        lo = max(0, int((ideal - CUT_SEARCH_SECONDS) / ENERGY_FRAME_SECONDS))
+        hi = min(len(energy), int((ideal + CUT_SEARCH_SECONDS) / ENERGY_FRAME_SECONDS) + 1)
+        quietest = lo + int(np.argmin(energy[lo:hi]))
+        cuts.append((quietest + 0.5) * ENERGY_FRAME_SECONDS)
+    return cuts
+
+def split_audio(path, chunks):
+    """Cut `path` into WAV chunks at quiet points
+
+    Every chunk carries CHUNK_OVERLAP_SECONDS of its neighbours' audio;
+    `offset` is where the chunk file starts and `start`/`end` the part of
+    the recording it is responsible for.
+    """
+    samples = load_audio(path)
+    duration = len(samples) / SAMPLE_RATE
+    bounds = [0.0] + find_cuts(samples, chunks) + [duration]
+    if len(bounds) == 2:
+        return duration, [{"audio": path, "offset": 0.0, "start": 0.0, "end": duration}]
+
+    directory = path + ".chunks"
+    os.makedirs(directory, exist_ok=True)
+    parts = []
+    for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        offset = max(0.0, start - CHUNK_OVERLAP_SECONDS)
+        stop = min(duration, end + CHUNK_OVERLAP_SECONDS)
+        chunk_path = os.path.join(directory, f"{index:03d}.wav")
+        write_wav(chunk_path, samples[int(offset * SAMPLE_RATE):int(stop * SAMPLE_RATE)])
+        parts.append({"audio": chunk_path, "offset": offset, "start": start, "end": end})
+    return duration, parts
+
+def parse_timestamp(hours, minutes, seconds):
+    """Seconds from the groups of a TIMESTAMP match"""
+    return int(hours or 0) * 3600 + int(minutes) * 60 + float(seconds)
+
+def format_timestamp(seconds):
+    """Timestamp in whisper's verbose format (hours only when non-zero)"""
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    prefix = f"{hours:02d}:" if hours else ""
+    return f"{prefix}{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+class SegmentTap:
+    """Stand-in for sys.stdout that reports segments as they are decoded
+
+    whisper prints one line per segment in verbose mode. Lines are parsed
+    as they complete, so memory stays bounded however long the job runs;
+    anything that is not a segment line is passed on to `passthrough`.
+    """
+
+    def __init__(self, on_segment, passthrough):
+        self.on_segment = on_segment
+        self.passthrough = passthrough
+        self.partial = ""
+
+    def write(self, data):
+        lines = (self.partial + data).split("\n")
+        # An overlong line keeps its start, where the timestamps are
+        self.partial = lines.pop()[:MAX_LINE_BYTES]
+        for line in lines:
+            self.feed(line)
+        return len(data)
+
+    def feed(self, line):
+        match = SEGMENT_LINE.match(line)
+        if match:
+            groups = match.groups()
+            self.on_segment(parse_timestamp(*groups[0:3]), parse_timestamp(*groups[3:6]), groups[6].strip())
+        elif line:
+            self.passthrough.write(line + "\n")
+
+    def flush(self):
+        self.passthrough.flush()
+
+    def close(self):
+        if self.partial:
+            self.feed(self.partial)
+            self.partial = ""
+
+class StubModel:
+    """Deterministic stand-in for a Whisper model"""
+
+    def __init__(self, name):
+        self.name = name
+        # Real-time multiple the fake decoder runs at (0 = instant)
+        self.speed = float(os.environ.get("VIBE_STUB_SPEED", "0"))
+        time.sleep(float(os.environ.get("VIBE_STUB_LOAD_SECONDS", "0")))
+
+    def transcribe(self, audio, language=None, verbose=None, **kwargs):
+        if isinstance(audio, np.ndarray):
+            duration = len(audio) / SAMPLE_RATE
+            label = "pcm audio"
+        else:
+            duration = audio_duration(audio)
+            label = os.path.basename(audio)
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + STUB_SEGMENT_SECONDS)
+            if self.speed:
+                time.sleep((end - start) / self.speed)
+            segments.append({
+                "start": start,
+                "end": end,
+                "text": f" Segment {len(segments) + 1} of {label} ({self.name}).",
+            })
+            if verbose:
+                # Same line format as whisper, so progress parsing is exercised
+                print(f"[{format_timestamp(start)} --> {format_timestamp(end)}] {segments[-1]['text']}")
+            start = end
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language or "en",
+        }
+
+class ModelCache:
+    """Resident models under a memory budget, evicted least recently used first"""
+
+    def __init__(self, budget_gb, loader):
+        self.budget_gb = budget_gb
+        self.loader = loader
+        self.models = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    @staticmethod
+    def cost(name):
+        return MODEL_MEMORY_GB.get(name, DEFAULT_MODEL_MEMORY_GB)
+
+    @property
+    def used_gb(self):
+        return sum(self.cost(name) for name in self.models)
+
+    def get(self, name):
+        """Return the model called `name`, loading it on a miss"""
+        if name in self.models:
+            self.hits += 1
+            self.models.move_to_end(name)
+            self.load_seconds = 0.0
+            return self.models[name]
+
+        self.misses += 1
+        # Make room before loading so the budget is never exceeded; a model
+        # bigger than the whole budget still loads once everything else is gone
+        evicted = False
+        while self.models and self.used_gb + self.cost(name) > self.budget_gb:
+            self.models.popitem(last=False)
+            self.evictions += 1
+            evicted = True
+        if evicted:
+            release_memory()
+
+        start = time.monotonic()
+        self.models[name] = self.loader(name)
+        self.load_seconds = time.monotonic() - start
+        return self.models[name]
+
+    def stats(self):
+        return {
+            "resident": list(self.models),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "used_gb": self.used_gb,
+            "budget_gb": self.budget_gb,
+            "load_seconds": self.load_seconds,
+        }
+
+def release_memory():
+    """Return memory held by evicted models to the system"""
+    gc.collect()
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+class Worker:
+    def __init__(self, stub=False, memory_budget=None):
+        self.stub = stub
+        self.models = ModelCache(memory_budget or default_memory_budget(), self.load_model)
+
+    def load_model(self, name):
+        """Load the model called `name` from scratch"""
+        if self.stub:
+            return StubModel(name)
+        import whisper
+        return whisper.load_model(name)
+
+    def transcribe(self, job):
+        job_id = job["id"]
+        emit({"id": job_id, "type": "progress", "stage": "loading_model"})
+        model = self.models.get(job.get("model", "base"))
+
+        duration = audio_duration(job["audio"])
+        emit({"id": job_id, "type": "progress", "stage": "transcribing", "processed": 0, "duration": duration})
+
+        last_report = 0.0
+
+        def on_segment(start, end, text):
+            nonlocal last_report
+            emit({"id": job_id, "type": "segment", "start": start, "end": end, "text": text})
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                emit({
+                    "id": job_id,
+                    "type": "progress",
+                    "stage": "transcribing",
+                    "processed": min(end, duration),
+                    "duration": duration,
+                })
+
+        language = job.get("language", "auto")
+        audio = load_audio(job["audio"]) if is_pcm(job["audio"]) else job["audio"]
+        tap = SegmentTap(on_segment, sys.stderr)
+        sys.stdout = tap
+        try:
+            result = model.transcribe(
+                audio,
+                language=None if language == "auto" else language,
+                verbose=True,
+            )
+        finally:
+            tap.close()
+            sys.stdout = sys.stderr
+
+        emit({
+            "id": job_id,
+            "type": "result",
+            "language": result.get("language"),
+            "segments": [
+                {"start": segment["start"], "end": segment["end"], "text": segment["text"].strip()}
+                for segment in result["segments"]
+            ],
+            "cache": self.models.stats(),
+        })
+
+    def split(self, job):
+        duration, chunks = split_audio(job["audio"], int(job.get("chunks", 1)))
+        emit({"id": job["id"], "type": "result", "duration": duration, "chunks": chunks})
+
+    def handle(self, job):
+        try:
+            if job.get("type") == "transcribe":
+                self.transcribe(job)
+            elif job.get("type") == "split":
+                self.split(job)
+            else:
+                raise ValueError(f"Unknown job type: {job.get('type')}")
+        except Exception as error:
+            emit({"id": job.get("id"), "type": "error", "error": f"{type(error).__name__}: {error}"})
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-lived Whisper transcription worker")
+    parser.add_argument("--stub", action="store_true", default=os.environ.get("VIBE_WHISPER_STUB") == "1",
+                        help="use a deterministic fake model instead of whisper")
+    parser.add_argument("--memory-budget", type=float, default=0,
+                        help="GB of memory this worker's resident models may use (default: half of RAM)")
+    args = parser.parse_args()
+
+    claim_stdout()
+    worker = Worker(stub=args.stub, memory_budget=args.memory_budget)
+    emit({"type": "ready", "stub": worker.stub, "pid": os.getpid(), "cache": worker.models.stats()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError:
+            emit({"type": "error", "error": f"Invalid job: {line[:200]}"})
+            continue
+        worker.handle(job)
+
+if __name__ == "__main__":
+    main()
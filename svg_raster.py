@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+In-memory SVG rasterization with a backend probed once per process
+"""
+import functools
+import io
+import shutil
+import subprocess
+
+from PIL import Image
+
+@functools.lru_cache(maxsize=None)
+def probe_backend():
+    """Return the name of the best available rasterizer, or None"""
+    try:
+        # Importing cairosvg also loads the cairo shared library, which
+        # fails with OSError rather than ImportError when it is missing
+        import cairosvg  # noqa: F401
+        return "cairosvg"
+    except (ImportError, OSError):
+        pass
+    if shutil.which("rsvg-convert"):
+        return "rsvg-convert"
+    if shutil.which("convert"):
+        return "imagemagick"
+    return None
+
+def rasterize(svg, size):
+    """Render an SVG string to a size x size RGBA image
+
+    Returns None when no rasterizer is available. Data is passed in and
+    out of memory; the command-line backends read stdin and write stdout.
+    """
+    backend = probe_backend()
+    data = svg.encode('utf-8')
+
+    if backend == "cairosvg":
+        import cairosvg
+        png = cairosvg.svg2png(bytestring=data, output_width=size, output_height=size)
+    elif backend == "rsvg-convert":
+        png = subprocess.run(['rsvg-convert', '-w', str(size), '-h', str(size)],
+                             input=data, capture_output=True, check=True).stdout
+    elif backend == "imagemagick":
+        png = subprocess.run(['convert', '-background', 'none', '-size', f'{size}x{size}', 'svg:-', 'png:-'],
+                             input=data, capture_output=True, check=True).stdout
+    else:
+        return None
+
+    with Image.open(io.BytesIO(png)) as img:
+        return img.convert('RGBA')